@@ -1,23 +1,41 @@
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+import csv
+import io
+import json
+import os
+from datetime import date, datetime
+from typing import AsyncIterator, Dict, List, Optional
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, status, Query, Body, UploadFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy import tuple_
 from sqlalchemy.orm import selectinload
-from sqlmodel import select, func, Session
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.core.session import get_session
+from app.core.session import async_engine, get_async_session, run_concurrently
 from app.models.blog_web_post import BlogWebPost
 from app.models.entity import Entity
-from app.models.enums.platform import PlatformEnum
-from app.models.enums.url import URLListSortingEnum, URLTypeEnum
+from app.models.enums.url import HistoryBucketEnum, URLExportFormatEnum, URLListSortingEnum, URLTypeEnum
 from app.models.post import Post
 from app.models.url import URL
+from app.models.url_import_job import URLImportJob
+from app.models.url_reanalysis_job import URLReanalysisJob
+from app.models.url_latest_metrics import URLLatestMetrics
+from app.schemas.requests.url import BulkReanalyzeRequest, SnapshotIngestRequest
 from app.schemas.responses.error import ErrorResponse
 from app.schemas.responses.url import SimpleSuccessResponse, TotalURLCountResponse, URLListingResponse, \
-    URLAnalysisSummaryResponse, OverallURLSummaryResponse, URLSuccessItem, URLUploadResponse, URLAnalysisHistoryResponse
-from app.services.url import detect_platform, get_platform_summary, is_valid_url
-from app.utils.sqs import push_to_sqs
-from app.utils.date import  get_utc_range_from_ist_date
+    URLAnalysisSummaryResponse, OverallURLSummaryResponse, URLSuccessItem, URLUploadResponse, URLAnalysisHistoryResponse, \
+    DailyURLSummaryResponse, URLSummaryRangeResponse, URLImportJobResponse, URLAnalysisBulkResponse, \
+    URLReanalysisJobResponse, SnapshotIngestResponse
+from app.services.url import bulk_create_urls, bulk_reanalyze_urls, detect_platform, engagement_history_query, get_platform_summary, \
+    get_platform_summary_by_day, decode_url_listing_cursor, iter_url_details, latest_metrics_values, latest_snapshots_query, \
+    upsert_url_latest_metrics, url_analysis_summary, url_detail_row, url_ids_param, url_reanalysis_job_response
+from app.services.scrape_outbox import enqueue_scrape_jobs, get_outbox_job_counts, outbox_relay
+from app.services.snapshot_ingest import ingest_snapshots
+from app.services.url_import import run_url_import, save_upload_to_temp_file, url_import_job_response
+from app.utils.cache import response_cache
+from app.utils.downsample import lttb
+from app.utils.pagination import encode_cursor
 
 router = APIRouter()
 
@@ -102,83 +120,128 @@ async def url_listing(
             "engagement_rate_desc",
             description="Sort by engagement rate: engagement_rate_asc or engagement_rate_desc"
         ),
-        db: Session = Depends(get_session)
+        limit: int = Query(100, ge=1, le=1000, description="Maximum number of URLs to return"),
+        cursor: Optional[str] = Query(None, description="Cursor returned as next_cursor by the previous page"),
+        db: AsyncSession = Depends(get_async_session)
 ):
     try:
         try:
-            start_utc , end_utc = get_utc_range_from_ist_date(datetime.strptime(date_uploaded, "%Y-%m-%d"))
+            upload_date = datetime.strptime(date_uploaded, "%Y-%m-%d").date()
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-        url_data_map = {}
+        cache_key = response_cache.build_key(
+            "url_listing", date_uploaded=upload_date, sort_by=sort_by, limit=limit, cursor=cursor
+        )
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        url_type_filters = [
-            (Post, URLTypeEnum.POST),
-            (BlogWebPost, URLTypeEnum.WEB_POST)
-        ]
+        keyset = tuple_(URLLatestMetrics.engagementRate, URLLatestMetrics.dateUploaded, URLLatestMetrics.urlId)
+        descending = sort_by.value == "engagement_rate_desc"
 
-        for model, url_type in url_type_filters:
-            query = (
-                select(model)
-                .join(URL)
-                .join(Entity)
-                .where(URL.created_date.between(start_utc, end_utc))
-            )
+        query = (
+            select(URLLatestMetrics)
+            .where(URLLatestMetrics.uploadDate == upload_date)
+            .where(URLLatestMetrics.entityId.is_not(None))
+        )
+
+        if cursor:
+            try:
+                after = decode_url_listing_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+            query = query.where(keyset < after if descending else keyset > after)
 
-            results = db.exec(query).all()
-
-            for item in results:
-                url_obj = item.url
-                if not url_obj or not url_obj.entity or url_obj.type != url_type:
-                    continue
-
-                url_id = url_obj.id
-                if url_id not in url_data_map:
-                    url_data_map[url_id] = {
-                        "id": url_id,
-                        "url": url_obj.url,
-                        "engagement_rate": getattr(item, "engagementRate", 0),
-                        "platform": url_obj.entity.platform,
-                        "date_uploaded": url_obj.created_date.isoformat(),
-                        "date_analyzed": (
-                            getattr(item, "dateAnalysed", None).isoformat()
-                            if getattr(item, "dateAnalysed", None) else None
-                        ),
-                        "is_fetched": getattr(item, "isFetched", False),
-                        "is_broken_or_deleted": getattr(item, "isBrokenOrDeleted", False)
-                    }
-                else:
-                    # Replace if engagement rate is higher
-                    if getattr(item, "engagementRate", 0) > url_data_map[url_id]["engagement_rate"]:
-                        url_data_map[url_id]["engagement_rate"] = getattr(item, "engagementRate", 0)
-                        url_data_map[url_id]["date_analyzed"] = (
-                            getattr(item, "dateAnalysed", None).isoformat()
-                            if getattr(item, "dateAnalysed", None) else None
-                        )
-                        url_data_map[url_id]["is_fetched"] = getattr(item, "isFetched", False)
-                        url_data_map[url_id]["is_broken_or_deleted"] = getattr(item, "isBrokenOrDeleted", False)
-
-        url_details = list(url_data_map.values())
-
-        reverse = sort_by.value == "engagement_rate_desc"
-        url_details.sort(
-            key=lambda x: (
-                x.get("engagement_rate") or 0,
-                datetime.fromisoformat(
-                    (x.get("date_uploaded") or "1900-01-01T00:00:00").replace("Z", "")
-                )
-            ),
-            reverse=reverse
+        order = (
+            URLLatestMetrics.engagementRate, URLLatestMetrics.dateUploaded, URLLatestMetrics.urlId
         )
+        query = query.order_by(*(column.desc() if descending else column for column in order)).limit(limit + 1)
+        results = (await db.exec(query)).all()
 
-        return URLListingResponse(urls=url_details)
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            last = results[-1]
+            next_cursor = encode_cursor([last.engagementRate, last.dateUploaded, last.urlId])
 
+        url_details = [url_detail_row(item) for item in results]
+
+        response = URLListingResponse(urls=url_details, next_cursor=next_cursor)
+        response_cache.set(cache_key, response, upload_date)
+        return response
+
+    except HTTPException:
+        raise
     except Exception as e:
         print(e)
         raise HTTPException(
             status_code=500, detail="Failed to fetch URL details.")
 
 
+MAX_SUMMARY_RANGE_DAYS = 366
+MAX_BULK_ANALYSIS_IDS = 5000
+
+EXPORT_COLUMNS = [
+    "id", "url", "engagement_rate", "platform", "date_uploaded", "date_analyzed", "is_fetched", "is_broken_or_deleted"
+]
+
+
+async def stream_url_export(date_from: date, date_to: date, export_format: URLExportFormatEnum) -> AsyncIterator[str]:
+    # The request-scoped session is closed before the body is sent, so the stream owns its own
+    async with AsyncSession(async_engine) as db:
+        rows = iter_url_details(db, date_from, date_to)
+
+        if export_format == URLExportFormatEnum.csv:
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+            writer.writeheader()
+            async for row in rows:
+                writer.writerow(row)
+                if buffer.tell() >= 64 * 1024:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+        else:
+            async for row in rows:
+                yield json.dumps(row) + "\n"
+
+
+@router.get(
+    "/export",
+    responses={
+        200: {"description": "URL metrics streamed as NDJSON or CSV"},
+        400: {"description": "Invalid date range", "model": ErrorResponse},
+    },
+    summary="Export URL metrics for a date range",
+    tags=["URL"]
+)
+async def url_export(
+        date_from: str = Query(..., description="First upload date to export (YYYY-MM-DD)"),
+        date_to: str = Query(..., description="Last upload date to export (YYYY-MM-DD)"),
+        export_format: URLExportFormatEnum = Query(
+            URLExportFormatEnum.ndjson, alias="format", description="Export format: ndjson or csv"
+        ),
+):
+    try:
+        start_date = datetime.strptime(date_from, "%Y-%m-%d").date()
+        end_date = datetime.strptime(date_to, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+
+    media_type = "text/csv" if export_format == URLExportFormatEnum.csv else "application/x-ndjson"
+    filename = f"url-metrics-{start_date}-{end_date}.{export_format.value}"
+    return StreamingResponse(
+        stream_url_export(start_date, end_date, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
 @router.get("/summary", response_model=OverallURLSummaryResponse, responses={
     200: {"description": "Platform summary retrieved", "model": OverallURLSummaryResponse},
     500: {"model": ErrorResponse}
@@ -186,19 +249,24 @@ async def url_listing(
 async def platform_summary(
         date_uploaded: Optional[str] = Query(
             None, description="Filter URLs by creation date (YYYY-MM-DD)"),
-        db: Session = Depends(get_session)):
+        db: AsyncSession = Depends(get_async_session)):
     try:
-        created_date_filter = None
+        upload_date = None
         if date_uploaded:
             try:
-                start_utc , end_utc = get_utc_range_from_ist_date(datetime.strptime(date_uploaded, "%Y-%m-%d"))
+                upload_date = datetime.strptime(date_uploaded, "%Y-%m-%d").date()
             except ValueError:
                 raise HTTPException(
                     status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
 
-        summary = get_platform_summary(db, start_utc, end_utc)
+        cache_key = response_cache.build_key("url_summary", date_uploaded=upload_date)
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        return OverallURLSummaryResponse(
+        summary = await get_platform_summary(db, upload_date)
+
+        response = OverallURLSummaryResponse(
             total_urls_count=summary["total"],
             facebook_percent=summary["facebook_percent"],
             instagram_percent=summary["instagram_percent"],
@@ -206,6 +274,51 @@ async def platform_summary(
             youtube_percent=summary["youtube_percent"],
             top_performer=summary["top_performer"],
         )
+        response_cache.set(cache_key, response, upload_date)
+        return response
+
+    except Exception as e:
+        print(e)
+        raise HTTPException(
+            status_code=500, detail="Failed to fetch platform summary.")
+
+
+@router.get("/summary/range", response_model=URLSummaryRangeResponse, responses={
+    200: {"description": "Per-day platform summary retrieved", "model": URLSummaryRangeResponse},
+    400: {"description": "Invalid date range", "model": ErrorResponse},
+    500: {"model": ErrorResponse}
+}, summary="Get platform summary per upload day for a date range", tags=["URL"])
+async def platform_summary_range(
+        date_from: str = Query(..., description="First upload date of the range (YYYY-MM-DD)"),
+        date_to: str = Query(..., description="Last upload date of the range (YYYY-MM-DD)"),
+        db: AsyncSession = Depends(get_async_session)):
+    try:
+        start_date = datetime.strptime(date_from, "%Y-%m-%d").date()
+        end_date = datetime.strptime(date_to, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    if (end_date - start_date).days >= MAX_SUMMARY_RANGE_DAYS:
+        raise HTTPException(
+            status_code=400, detail=f"Date range cannot exceed {MAX_SUMMARY_RANGE_DAYS} days")
+
+    try:
+        summaries = await get_platform_summary_by_day(db, start_date, end_date)
+
+        return URLSummaryRangeResponse(days=[
+            DailyURLSummaryResponse(
+                date_uploaded=summary["date_uploaded"],
+                total_urls_count=summary["total"],
+                facebook_percent=summary["facebook_percent"],
+                instagram_percent=summary["instagram_percent"],
+                website_percent=summary["website_percent"],
+                youtube_percent=summary["youtube_percent"],
+                top_performer=summary["top_performer"],
+            )
+            for summary in summaries
+        ])
 
     except Exception as e:
         print(e)
@@ -219,10 +332,17 @@ async def platform_summary(
             status_code=status.HTTP_200_OK,
             summary="Get total URL count",
             tags=["URL"])
-async def url_count(db: Session = Depends(get_session)):
+async def url_count(db: AsyncSession = Depends(get_async_session)):
     try:
-        total_urls: int | None = db.exec(select(func.count(URL.id))).first()
-        return TotalURLCountResponse(total_urls=total_urls)
+        cache_key = response_cache.build_key("url_count")
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        total_urls: int | None = (await db.exec(select(func.count(URL.id)))).first()
+        response = TotalURLCountResponse(total_urls=total_urls)
+        response_cache.set(cache_key, response)
+        return response
     except Exception as err:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(err))
@@ -232,116 +352,104 @@ async def url_count(db: Session = Depends(get_session)):
     200: {"description": "All URL retrieved", "model": URLListingResponse},
     500: {"model": ErrorResponse}
 }, summary="Get URL analysis", tags=["URL"])
-async def get_url_analysis(url_id: int, db: Session = Depends(get_session)):
+async def get_url_analysis(url_id: int):
     try:
-        url: Optional[URL] = db.exec(
-            select(URL)
-            .options(
-                selectinload(URL.entity),
-                selectinload(URL.posts),
-                selectinload(URL.blogWebPosts)
-            )
-            .where(URL.id == url_id)
-        ).first()
+        # The URL and its latest snapshot of either kind are independent lookups
+        url_rows, post_rows, blog_rows = await run_concurrently(
+            select(URL).options(selectinload(URL.entity)).where(URL.id == url_id),
+            select(Post).where(Post.urlId == url_id).order_by(Post.dateAnalysed.desc()).limit(1),
+            select(BlogWebPost).where(BlogWebPost.urlId == url_id).order_by(BlogWebPost.dateAnalysed.desc()).limit(1),
+        )
+        url: Optional[URL] = url_rows[0] if url_rows else None
 
         if not url:
             raise HTTPException(status_code=404, detail="URL not found")
 
-        response_data = {
-            "url_id": url.id,
-            "post_url": url.url,
-            "user_profile_name": url.entity.fullname if url.entity else None,
-            "url_type": url.type,
-            "platform": url.entity.platform if url.entity else None,
-            "latest_likes": None,
-            "latest_views": None,
-            "latest_comments": None,
-            "latest_engagement_rate": 0.0,
-            "traffic_count": None,
-            "is_broken_or_deleted": False,
-            "is_fetched": False
-        }
-
-        # Depending on URL type, fetch and update
-        if url.type == URLTypeEnum.POST:
-            if url.posts:
-                latest_post = max(url.posts, key=lambda p: p.dateAnalysed)
-                response_data.update({
-                    "latest_likes": latest_post.likes,
-                    "latest_views": latest_post.views,
-                    "latest_comments": latest_post.comments,
-                    "latest_engagement_rate": latest_post.engagementRate,
-                    "is_broken_or_deleted": latest_post.isBrokenOrDeleted,
-                    "is_fetched": latest_post.isFetched
-                })
-
-        elif url.type == URLTypeEnum.WEB_POST:
-            if url.blogWebPosts:
-                latest_blog = max(url.blogWebPosts,
-                                  key=lambda b: b.dateAnalysed)
-                response_data.update({
-                    "latest_engagement_rate": latest_blog.engagementRate,
-                    "traffic_count": latest_blog.trafficCount,
-                    "is_broken_or_deleted": latest_blog.isBrokenOrDeleted,
-                    "is_fetched": latest_blog.isFetched
-                })
-
-        else:
+        if url.type not in (URLTypeEnum.POST, URLTypeEnum.WEB_POST):
             raise HTTPException(
                 status_code=400, detail=f"Unsupported URL type: {url.type}")
 
+        response_data = url_analysis_summary(
+            url, url.entity, post_rows[0] if post_rows else None, blog_rows[0] if blog_rows else None)
         return URLAnalysisSummaryResponse(**response_data)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Failed to get URL analysis: {str(e)}")
 
 
+@router.post("/analysis/bulk", response_model=URLAnalysisBulkResponse, responses={
+    200: {"description": "URL analyses retrieved", "model": URLAnalysisBulkResponse},
+    400: {"description": "Too many url_ids", "model": ErrorResponse},
+    500: {"model": ErrorResponse}
+}, summary="Get URL analysis for many URLs", tags=["URL"])
+async def get_url_analysis_bulk(
+        body: List[int] = Body(..., description=f"Up to {MAX_BULK_ANALYSIS_IDS} URL ids")
+):
+    url_ids = list(dict.fromkeys(body))
+    if len(url_ids) > MAX_BULK_ANALYSIS_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ANALYSIS_IDS} url_ids are allowed")
+
+    try:
+        # One query per table, each loading only the latest snapshot of every URL
+        url_rows, post_rows, blog_rows = await run_concurrently(
+            select(URL, Entity).outerjoin(Entity, URL.entityId == Entity.id).where(URL.id == url_ids_param(url_ids)),
+            latest_snapshots_query(Post, url_ids),
+            latest_snapshots_query(BlogWebPost, url_ids),
+        )
+        urls = {url.id: (url, entity) for url, entity in url_rows}
+        posts = {post.urlId: post for post in post_rows}
+        blogs = {blog.urlId: blog for blog in blog_rows}
+
+        return URLAnalysisBulkResponse(
+            items=[
+                URLAnalysisSummaryResponse(**url_analysis_summary(
+                    *urls[url_id], posts.get(url_id), blogs.get(url_id)))
+                for url_id in url_ids if url_id in urls
+            ],
+            missing_url_ids=[url_id for url_id in url_ids if url_id not in urls],
+        )
+
+    except Exception as e:
+        print(e)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to get URL analysis: {str(e)}")
+
+
 @router.get("/engagement-history/{url_id}", response_model=list[URLAnalysisHistoryResponse], responses={
     200: {"description": "Engagement history retrieved"},
     404: {"description": "URL not found"},
     500: {"description": "Server error"}
 }, summary="Get engagement history for a URL", tags=["URL"])
-async def get_url_engagement_history(url_id: int, db: Session = Depends(get_session)):
+async def get_url_engagement_history(
+        url_id: int,
+        bucket: Optional[HistoryBucketEnum] = Query(
+            None, description="Keep only the last snapshot of every hour, day or week"),
+        max_points: int = Query(
+            1000, ge=3, le=10000, description="Downsample longer series to this many points (LTTB)"),
+        db: AsyncSession = Depends(get_async_session)
+):
     try:
-        url: Optional[URL] = db.exec(
-            select(URL)
-            .options(
-                selectinload(URL.posts),
-                selectinload(URL.blogWebPosts)
-            )
-            .where(URL.id == url_id)
-        ).first()
+        url_type = (await db.exec(select(URL.type).where(URL.id == url_id))).first()
 
-        if not url:
+        if not url_type:
             raise HTTPException(status_code=404, detail="URL not found")
 
-        data_points: list[URLAnalysisHistoryResponse] = []
-
-        if url.type == URLTypeEnum.POST:
-            for post in url.posts:
-                data_points.append(URLAnalysisHistoryResponse(
-                    date_analyzed=post.dateAnalysed.date(),
-                    likes=post.likes,
-                    views=post.views,
-                    comments=post.comments,
-                    engagement_rate=post.engagementRate,
-                ))
-
-        elif url.type == URLTypeEnum.WEB_POST:
-            for blog in url.blogWebPosts:
-                data_points.append(URLAnalysisHistoryResponse(
-                    date_analyzed=blog.dateAnalysed.date(),
-                    traffic_count=blog.trafficCount,
-                    engagement_rate=blog.engagementRate,
-                ))
+        if url_type not in (URLTypeEnum.POST, URLTypeEnum.WEB_POST):
+            raise HTTPException(status_code=400, detail=f"Unsupported URL type: {url_type}")
 
-        else:
-            raise HTTPException(status_code=400, detail=f"Unsupported URL type: {url.type}")
+        rows = (await db.exec(engagement_history_query(url_type, url_id, bucket))).all()
+        rows = lttb(rows, max_points, x=lambda row: row.date_analyzed.timestamp(), y=lambda row: row.engagement_rate)
 
-        # Sort by date_analyzed ascending
-        return sorted(data_points, key=lambda x: x.date_analyzed)
+        return [
+            URLAnalysisHistoryResponse(**{**row._mapping, "date_analyzed": row.date_analyzed.date()})
+            for row in rows
+        ]
 
+    except HTTPException:
+        raise
     except Exception as e:
         print("ereresrr", e)
         raise HTTPException(status_code=500, detail=f"Failed to get engagement history: {str(e)}")
@@ -350,92 +458,66 @@ async def get_url_engagement_history(url_id: int, db: Session = Depends(get_sess
 @router.post("/upload-urls", response_model=URLUploadResponse, summary="Upload and classify URLs")
 async def upload_urls(
         body: List[str] = Body(..., description="List of URLs to upload"),
-        db: Session = Depends(get_session)
+        db: AsyncSession = Depends(get_async_session)
 ):
-    added_count = 0
-    success_urls: List[URLSuccessItem] = []
-    failed_urls: List[str] = []
-
-    unique_urls = list(set(url.strip() for url in body if url.strip()))
-
-    for raw_url in unique_urls:
-        if not is_valid_url(raw_url):
-            failed_urls.append(raw_url)
-            continue
-
-        existing_url = db.exec(select(URL).where(URL.url == raw_url)).first()
-        if existing_url:
-            failed_urls.append(f"{raw_url} (already exists)")
-            continue
+    success_urls, failed_urls = await bulk_create_urls(db, body)
 
-        try:
-            platform = detect_platform(raw_url)
-            url_type = (
-                URLTypeEnum.POST
-                if platform in [PlatformEnum.FACEBOOK, PlatformEnum.INSTAGRAM, PlatformEnum.YOUTUBE]
-                else URLTypeEnum.WEB_POST
-            )
-
-            new_url = URL(
-                url=raw_url,
-                type=url_type,
-            )
-            db.add(new_url)
-            db.commit()
-            db.refresh(new_url)
-
-            post_id = web_id = None
-            if url_type == URLTypeEnum.POST:
-                post = Post(
-                    urlId=new_url.id,
-                    comments=0,
-                    likes=0,
-                    views=0,
-                    engagementRate=0,
-                    dateAnalysed=datetime.now(timezone.utc),
-                    isBrokenOrDeleted=False,
-                    isFetched=False
-                )
-                db.add(post)
-                db.commit()
-                db.refresh(post)
-                post_id = post.id
-            else:
-                blog = BlogWebPost(
-                    urlId=new_url.id,
-                    trafficCount=0,
-                    engagementRate=0,
-                    dateAnalysed=datetime.now(timezone.utc),
-                    isBrokenOrDeleted=False,
-                    isFetched=False
-                )
-                db.add(blog)
-                db.commit()
-                db.refresh(blog)
-                web_id = blog.id
-
-            added_count += 1
-            success_urls.append(URLSuccessItem(
-                url_id=new_url.id,
-                url=new_url.url,
-                platform=platform,
-                post_id=post_id,
-                web_id=web_id
-            ))
-
-        except Exception as e:
-            db.rollback()
-            failed_urls.append(f"{raw_url} (error: {str(e)})")
     if success_urls:
-        push_to_sqs(success_urls)
+        outbox_relay.wake()
     return URLUploadResponse(
         success=True,
         message="URL upload completed",
-        added_count=added_count,
+        added_count=len(success_urls),
         failed_urls=failed_urls,
     )
 
 
+@router.post("/import", response_model=URLImportJobResponse, status_code=status.HTTP_202_ACCEPTED,
+             summary="Import URLs from a newline-separated or CSV file",
+             responses={
+                 202: {"description": "Import job created, URLs are processed in the background"},
+                 500: {"description": "Server error"}
+             }
+             )
+async def import_urls(
+        background_tasks: BackgroundTasks,
+        file: UploadFile = File(..., description="One URL per line, or a CSV with the URL in the first column"),
+        db: AsyncSession = Depends(get_async_session)
+):
+    path, line_count = await save_upload_to_temp_file(file)
+    try:
+        job = URLImportJob(filename=file.filename, totalCount=line_count)
+        db.add(job)
+        await db.commit()
+    except Exception as e:
+        print(e)
+        os.remove(path)
+        raise HTTPException(status_code=500, detail="Failed to create import job.")
+
+    background_tasks.add_task(run_url_import, job.id, path)
+    return url_import_job_response(job)
+
+
+@router.get("/import/{job_id}", response_model=URLImportJobResponse, summary="Get URL import job progress",
+            responses={
+                200: {"description": "Import job progress"},
+                404: {"description": "Import job not found", "model": ErrorResponse},
+                500: {"description": "Server error", "model": ErrorResponse}
+            })
+async def get_import_job(job_id: int, db: AsyncSession = Depends(get_async_session)):
+    try:
+        job = await db.get(URLImportJob, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Import job not found")
+        return url_import_job_response(job)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail="Failed to fetch import job.")
+
+
 @router.post("/re-analyze-url", response_model=SimpleSuccessResponse, summary="Re-analyze URL by ID",
              responses={
                  200: {"description": "URL re-analysis triggered"},
@@ -445,14 +527,15 @@ async def upload_urls(
              )
 async def reanalyze_url(
         body: Dict[str, int] = Body(..., example={"url_id": 123}),
-        db: Session = Depends(get_session)
+        db: AsyncSession = Depends(get_async_session)
 ):
     url_id = body.get("url_id")
     if not url_id:
         raise HTTPException(
             status_code=400, detail="Missing 'url_id' in request body.")
 
-    url = db.exec(select(URL).where(URL.id == url_id)).first()
+    url = (await db.exec(
+        select(URL).options(selectinload(URL.entity)).where(URL.id == url_id))).first()
     if not url:
         raise HTTPException(
             status_code=404, detail=f"URL with id {url_id} not found.")
@@ -461,21 +544,24 @@ async def reanalyze_url(
     try:
         post_id = web_id = None
         if url.type == URLTypeEnum.POST:
-            post = db.exec(select(Post).where(Post.urlId == url.id)).first()
+            snapshot = post = (await db.exec(
+                select(Post).where(Post.urlId == url.id).order_by(Post.dateAnalysed.desc()))).first()
             if post:
                 post.isFetched = False
                 db.add(post)
                 post_id = post.id
         else:
-            blog = db.exec(select(BlogWebPost).where(
-                BlogWebPost.urlId == url.id)).first()
+            snapshot = blog = (await db.exec(select(BlogWebPost).where(
+                BlogWebPost.urlId == url.id).order_by(BlogWebPost.dateAnalysed.desc()))).first()
             if blog:
                 blog.isFetched = False
                 db.add(blog)
                 web_id = blog.id
 
-        db.commit()
-        push_to_sqs([URLSuccessItem(
+        if snapshot:
+            await upsert_url_latest_metrics(db, [latest_metrics_values(
+                url, snapshot, url.entity.platform if url.entity else platform)])
+        await enqueue_scrape_jobs(db, [URLSuccessItem(
             url_id=url.id,
             url=url.url,
             platform=platform,
@@ -483,12 +569,77 @@ async def reanalyze_url(
             web_id=web_id,
             is_reanalysis=True
         )])
+        await db.commit()
+        outbox_relay.wake()
         return SimpleSuccessResponse(
             success=True,
             message="URL re-analysis triggered",
         )
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=500, detail=f"Failed to re-analyze URL: {str(e)}")
+
+
+@router.post("/re-analyze", response_model=URLReanalysisJobResponse, status_code=status.HTTP_202_ACCEPTED,
+             summary="Re-analyze every URL matching the filters",
+             responses={
+                 202: {"description": "URLs marked for re-analysis, scrape messages queued"},
+                 422: {"description": "No filter or invalid filters"},
+                 500: {"description": "Server error"}
+             }
+             )
+async def bulk_reanalyze(
+        body: BulkReanalyzeRequest,
+        db: AsyncSession = Depends(get_async_session)
+):
+    try:
+        job = await bulk_reanalyze_urls(db, body)
+    except Exception as e:
+        print(e)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to re-analyze URLs: {str(e)}")
+
+    outbox_relay.wake()
+    return url_reanalysis_job_response(job, pending_count=job.matchedCount, failed_count=0)
+
+
+@router.get("/re-analyze/{job_id}", response_model=URLReanalysisJobResponse, summary="Get bulk re-analysis progress",
+            responses={
+                200: {"description": "Re-analysis job progress"},
+                404: {"description": "Re-analysis job not found", "model": ErrorResponse},
+                500: {"description": "Server error", "model": ErrorResponse}
+            })
+async def get_reanalysis_job(job_id: str, db: AsyncSession = Depends(get_async_session)):
+    try:
+        job = await db.get(URLReanalysisJob, job_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Re-analysis job not found")
+
+        pending_count, failed_count = await get_outbox_job_counts(db, job.id)
+        return url_reanalysis_job_response(job, pending_count=pending_count, failed_count=failed_count)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(e)
+        raise HTTPException(status_code=500, detail="Failed to fetch re-analysis job.")
+
+
+@router.post("/snapshots", response_model=SnapshotIngestResponse, summary="Ingest a batch of scrape results",
+             responses={
+                 200: {"description": "Snapshots stored, URL state and owners updated"},
+                 422: {"description": "Invalid or too many snapshots"},
+                 500: {"description": "Server error", "model": ErrorResponse}
+             })
+async def ingest_url_snapshots(
+        body: SnapshotIngestRequest,
+        db: AsyncSession = Depends(get_async_session)
+):
+    try:
+        return await ingest_snapshots(db, body.snapshots)
+    except Exception as e:
+        print(e)
+        raise HTTPException(
+            status_code=500, detail=f"Failed to ingest snapshots: {str(e)}")
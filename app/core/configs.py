@@ -1,5 +1,5 @@
 import os
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 
 from pydantic import PostgresDsn, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -21,6 +21,38 @@ class Settings(BaseSettings):
     ACCESS_KEY_ID: Optional[str] = None
     SECRET_ACCESS_KEY: Optional[str] = None
 
+    # SQS publisher configs (SQS_IN_MEMORY keeps messages in process for local runs)
+    SQS_IN_MEMORY: bool = False
+    SQS_PUBLISHER_MAX_RETRIES: int = 5
+    SQS_PUBLISHER_RETRY_BASE_DELAY_SECONDS: float = 0.2
+
+    # Scrape outbox relay configs (disable to run relays only as separate processes)
+    OUTBOX_RELAY_ENABLED: bool = True
+    OUTBOX_RELAY_BATCH_SIZE: int = 500
+    OUTBOX_RELAY_POLL_INTERVAL_SECONDS: float = 1.0
+    OUTBOX_MAX_ATTEMPTS: int = 20
+
+    # Scrape worker configs (concurrency per platform queue; platforms listed in
+    # SCRAPE_WORKER_PROCESS_PLATFORMS run their extractor in processes instead of threads)
+    SCRAPE_WORKER_CONCURRENCY: Dict[str, int] = {"INSTAGRAM": 2, "FACEBOOK": 4, "YOUTUBE": 8, "WEBSITE": 16}
+    SCRAPE_WORKER_PROCESS_PLATFORMS: List[str] = []
+    SCRAPE_WORKER_WAIT_TIME_SECONDS: int = 20
+    SCRAPE_WORKER_VISIBILITY_TIMEOUT_SECONDS: int = 120
+    SCRAPE_WORKER_INGEST_BATCH_SIZE: int = 200
+    SCRAPE_WORKER_FLUSH_INTERVAL_SECONDS: float = 2.0
+    # Messages per call of a batch extractor (YouTube Data API takes 50 ids per call)
+    SCRAPE_WORKER_EXTRACTION_BATCH_SIZE: int = 50
+    YOUTUBE_API_KEY: Optional[str] = None
+
+    # Owner profile cache configs (OWNER_PROFILE_CACHE_PERSIST also reuses profiles stored on entity)
+    OWNER_PROFILE_CACHE_TTL_SECONDS: int = 6 * 60 * 60
+    OWNER_PROFILE_CACHE_MAX_ENTRIES: int = 100_000
+    OWNER_PROFILE_CACHE_PERSIST: bool = True
+
+    # Response cache configs
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
@@ -0,0 +1,25 @@
+"""
+Run a standalone scrape outbox relay.
+
+Usage:
+    ENV=local uv run python -m app.core.outbox_relay
+
+Relays claim rows with FOR UPDATE SKIP LOCKED, so any number of these can run
+next to the relay started by the API (see OUTBOX_RELAY_ENABLED).
+"""
+import asyncio
+
+from app.core.session import async_engine
+from app.services.scrape_outbox import outbox_relay
+
+
+async def main():
+    try:
+        await outbox_relay.run()
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    async_engine.echo = False
+    asyncio.run(main())
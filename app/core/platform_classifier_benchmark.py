@@ -0,0 +1,84 @@
+"""
+Compare PlatformClassifier with the urlparse-based detect_platform it replaced.
+
+Usage:
+    uv run python -m app.core.platform_classifier_benchmark [--count 1000000]
+
+Generates a mix of platform and website URLs, times the legacy function,
+classify() and classify_many() over the same list and reports any URL the
+legacy function recognised that the classifier labels differently.
+"""
+import argparse
+import random
+import time
+from typing import Callable, List
+from urllib.parse import urlparse
+
+from app.models.enums.platform import PlatformEnum
+from app.services.platform_classifier import platform_classifier
+
+SAMPLE_URLS = [
+    "https://www.instagram.com/reel/DLMa69noWxC/?igsh=MWQ1ZGUx",
+    "https://instagram.com/p/CqnlnyUouPe/",
+    "https://instagr.am/p/CqnlnyUouPe/",
+    "https://www.facebook.com/somepage/posts/1234567890",
+    "https://m.facebook.com/story.php?story_fbid=123&id=456",
+    "https://web.facebook.com/reel/987654321",
+    "https://fb.watch/abcDEF123/",
+    "https://www.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://m.youtube.com/watch?v=dQw4w9WgXcQ",
+    "https://youtu.be/dQw4w9WgXcQ?si=share",
+    "https://www.youtube.com/shorts/dQw4w9WgXcQ",
+    "https://blog.example.com/2025/06/post-title",
+    "https://news.example.org/article?id=42&utm_source=x",
+    "http://www.website-{n}.com/page/{n}",
+]
+
+
+def legacy_detect_platform(url: str) -> str:
+    try:
+        parsed = urlparse(url.lower())
+        domain = parsed.netloc.replace("www.", "")
+
+        if domain in {"facebook.com", "m.facebook.com"}:
+            return PlatformEnum.FACEBOOK.value
+        elif domain in {"instagram.com"}:
+            return PlatformEnum.INSTAGRAM.value
+        elif domain in {"youtube.com", "youtu.be"}:
+            return PlatformEnum.YOUTUBE.value
+        else:
+            return PlatformEnum.WEBSITE.value
+
+    except Exception:
+        return PlatformEnum.WEBSITE.value
+
+
+def generate_urls(count: int, seed: int = 7) -> List[str]:
+    rnd = random.Random(seed)
+    return [rnd.choice(SAMPLE_URLS).format(n=rnd.randint(0, 5000)) for _ in range(count)]
+
+
+def timed(name: str, count: int, run: Callable[[], List[str]]) -> List[str]:
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed:8.3f}s  {count / elapsed / 1_000_000:6.2f}M urls/s")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    urls = generate_urls(args.count)
+    legacy = timed("legacy detect_platform", args.count, lambda: [legacy_detect_platform(url) for url in urls])
+    timed("PlatformClassifier.classify", args.count, lambda: [platform_classifier.classify(url) for url in urls])
+    batch = timed("classify_many", args.count, lambda: platform_classifier.classify_many(urls))
+
+    mismatches = {url for url, old, new in zip(urls, legacy, batch)
+                  if old != PlatformEnum.WEBSITE.value and old != new}
+    newly_recognised = {url for url, old, new in zip(urls, legacy, batch) if old != new} - mismatches
+    for url in sorted(mismatches):
+        print(f"❌ regression: {url}")
+    print(f"Recognised only by the classifier: {len(newly_recognised)} distinct URLs")
@@ -0,0 +1,90 @@
+"""
+Report hot-path queries whose plan still contains a sequential scan.
+
+Usage:
+    ENV=local uv run python -m app.core.query_plans [--allow-seqscan]
+
+By default the check runs with enable_seqscan off, so a Seq Scan in the plan
+means no index can serve the query at all (small tables would otherwise be
+seq-scanned regardless of indexes). Exits with status 1 if any query seq-scans.
+"""
+import json
+import sys
+from datetime import timedelta
+from typing import Iterator, List, Tuple
+
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, select, text, tuple_
+
+from app.core.session import engine
+from app.models.blog_web_post import BlogWebPost
+from app.models.entity_metrics import EntityMetrics
+from app.models.post import Post
+from app.models.url import URL
+from app.models.url_latest_metrics import URLLatestMetrics
+from app.services.profile import profile_analysis_queries
+from app.services.url import latest_snapshots_query, platform_summary_columns
+from app.utils.canonical_url import canonical_key
+from app.utils.date import get_ist_date, get_utc_now
+
+
+def hot_queries() -> List[Tuple[str, object]]:
+    now = get_utc_now()
+    today = get_ist_date(now)
+    keyset = (URLLatestMetrics.engagementRate, URLLatestMetrics.dateUploaded, URLLatestMetrics.urlId)
+
+    return [
+        ("url listing page", select(URLLatestMetrics)
+         .where(URLLatestMetrics.uploadDate == today, URLLatestMetrics.entityId.is_not(None))
+         .where(tuple_(*keyset) < (50, now, 1_000_000))
+         .order_by(*(column.desc() for column in keyset)).limit(101)),
+        ("platform summary by day", select(*platform_summary_columns())
+         .where(URLLatestMetrics.uploadDate == today, URLLatestMetrics.entityId.is_not(None))
+         .group_by(URLLatestMetrics.platform)),
+        ("latest post of url", select(Post).where(Post.urlId == 1).order_by(Post.dateAnalysed.desc()).limit(1)),
+        ("latest blog post of url", select(BlogWebPost)
+         .where(BlogWebPost.urlId == 1).order_by(BlogWebPost.dateAnalysed.desc()).limit(1)),
+        ("latest posts of many urls", latest_snapshots_query(Post, [1, 2, 3])),
+        ("url by address", select(URL).where(URL.url == "https://example.com/")),
+        ("url by canonical key", select(URL.canonicalKey)
+         .where(URL.canonicalKey == canonical_key("https://example.com/"))),
+        ("urls of entity", select(URL).where(URL.entityId == 1)),
+        ("latest metrics of entity", select(URLLatestMetrics).where(URLLatestMetrics.entityId == 1)),
+        ("metrics of entity", select(EntityMetrics).where(EntityMetrics.entityId == 1)),
+        ("windowed totals of entity", profile_analysis_queries(1, now - timedelta(days=30), now)[1]),
+        ("urls created in range", select(URL).where(URL.created_date.between(now - timedelta(days=1), now))),
+    ]
+
+
+def iter_seq_scans(plan: dict) -> Iterator[str]:
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan.get("Relation Name", "?")
+    for child in plan.get("Plans", []):
+        yield from iter_seq_scans(child)
+
+
+def check_query_plans(allow_seqscan: bool = False) -> List[Tuple[str, List[str]]]:
+    """Explain every hot query and return (name, seq-scanned tables) for the offending ones."""
+    offenders = []
+    with Session(engine) as session:
+        if not allow_seqscan:
+            session.exec(text("SET LOCAL enable_seqscan = off"))
+        for name, query in hot_queries():
+            sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            plan = session.exec(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            tables = list(iter_seq_scans(plan[0]["Plan"]))
+            if tables:
+                offenders.append((name, tables))
+        session.rollback()
+    return offenders
+
+
+if __name__ == "__main__":
+    engine.echo = False
+    offenders = check_query_plans(allow_seqscan="--allow-seqscan" in sys.argv)
+    for name, tables in offenders:
+        print(f"❌ {name}: Seq Scan on {', '.join(tables)}")
+    if offenders:
+        sys.exit(1)
+    print("✅ No hot query plan uses a sequential scan.")
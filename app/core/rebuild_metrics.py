@@ -0,0 +1,29 @@
+"""
+Recompute url_latest_metrics and entity_metrics from the snapshot tables.
+
+Usage:
+    ENV=local uv run python -m app.core.rebuild_metrics
+
+entity_metrics is otherwise only moved by deltas on snapshot writes; run this
+after writes that bypass them (e.g. URLs linked to entities outside the API)
+or to repair drift.
+"""
+from sqlmodel import Session
+
+from app.core.session import engine
+from app.services.entity_metrics import rebuild_entity_metrics
+from app.services.url import rebuild_url_latest_metrics
+
+
+def main():
+    with Session(engine) as session:
+        print("Rebuilding url_latest_metrics...")
+        rebuild_url_latest_metrics(session)
+        print("Rebuilding entity_metrics...")
+        rebuild_entity_metrics(session)
+        print("✅ Metrics rebuilt.")
+
+
+if __name__ == "__main__":
+    engine.echo = False
+    main()
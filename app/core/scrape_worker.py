@@ -0,0 +1,109 @@
+"""
+Run the scrape worker against the per-platform SQS queues.
+
+Usage:
+    ENV=local uv run python -m app.core.scrape_worker
+    uv run python -m app.core.scrape_worker --benchmark [--count 10000] [--latency 0.05] [--processes] [--batched]
+
+With --benchmark nothing leaves the process: the worker consumes an
+in-memory queue filled with --count messages, extractors sleep for --latency
+seconds (or burn that much CPU with --processes, which runs them in process
+pools) instead of scraping, and results are counted instead of stored. With
+--batched YouTube goes through a batch extractor taking --latency per call of
+up to SCRAPE_WORKER_EXTRACTION_BATCH_SIZE URLs, like the YouTube Data API. It
+reports URLs per second for the configured SCRAPE_WORKER_CONCURRENCY.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import random
+import time
+from typing import List
+
+from app.core.session import async_engine
+from app.schemas.requests.url import SnapshotIngestItem
+from app.utils.sqs import QUEUE_MAP, InMemorySQSClient
+from app.worker.runtime import ScrapeWorker
+
+
+def simulated_extract(url: str, latency: float, busy: bool) -> dict:
+    if busy:
+        deadline = time.perf_counter() + latency
+        while time.perf_counter() < deadline:
+            pass
+    else:
+        time.sleep(latency)
+    return {"likes": random.randint(0, 1000), "comments": random.randint(0, 100), "engagement_rate": 1}
+
+
+def simulated_extract_batch(urls: List[str], latency: float, busy: bool) -> List[dict]:
+    result = simulated_extract(urls[0], latency, busy)
+    return [result] * len(urls)
+
+
+async def benchmark(count: int, latency: float, processes: bool, batched: bool) -> None:
+    client = InMemorySQSClient()
+    done = asyncio.Event()
+    stored = 0
+
+    async def count_results(items: List[SnapshotIngestItem]) -> None:
+        nonlocal stored
+        stored += len(items)
+        if stored >= count:
+            done.set()
+
+    extractor = functools.partial(simulated_extract, latency=latency, busy=processes)
+    worker = ScrapeWorker(
+        client=client,
+        extractors={platform: extractor for platform in QUEUE_MAP},
+        sink=count_results,
+        process_platforms=QUEUE_MAP if processes else (),
+        batch_extractors={
+            "YOUTUBE": functools.partial(simulated_extract_batch, latency=latency, busy=processes)
+        } if batched else {},
+    )
+    worker.wait_time = 1
+
+    # Only fill the queues the configured concurrency consumes
+    platforms = list(worker.concurrency)
+    for i in range(count):
+        platform = platforms[i % len(platforms)]
+        body = json.dumps({"url_id": i, "url": f"https://example.com/{i}", "platform": platform, "post_id": i})
+        client.send_message_batch(QueueUrl=QUEUE_MAP[platform], Entries=[{"Id": "0", "MessageBody": body}])
+
+    start = time.perf_counter()
+    await worker.start()
+    await done.wait()
+    await worker.stop()
+    elapsed = time.perf_counter() - start
+
+    print(f"Concurrency: {worker.concurrency} ({'processes' if processes else 'threads'})")
+    print(f"{stored} URLs in {elapsed:.2f}s: {stored / elapsed:.1f} URLs/s, {client.calls} SQS calls, "
+          f"{client.in_flight_count()} messages left in flight")
+
+
+async def main():
+    try:
+        await ScrapeWorker().run()
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--count", type=int, default=10_000)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--processes", action="store_true")
+    parser.add_argument("--batched", action="store_true")
+    args = parser.parse_args()
+
+    async_engine.echo = False
+    try:
+        if args.benchmark:
+            asyncio.run(benchmark(args.count, args.latency, args.processes, args.batched))
+        else:
+            asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
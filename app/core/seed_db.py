@@ -11,6 +11,9 @@ from app.models.enums.platform import PlatformEnum
 from app.models.enums.url import URLTypeEnum
 from app.models.post import Post
 from app.models.url import URL
+from app.services.entity_metrics import rebuild_entity_metrics
+from app.services.url import rebuild_url_latest_metrics
+from app.utils.canonical_url import canonical_key
 
 fake = Faker()
 
@@ -33,8 +36,10 @@ def seed_entities(session: Session, count: int = 5) -> list[Entity]:
 def seed_urls(session: Session, entities: list[Entity], count: int = 10) -> list[URL]:
     urls = []
     for _ in range(count):
+        address = fake.url()
         url = URL(
-            url=fake.url(),
+            url=address,
+            canonicalKey=canonical_key(address),
             type=random.choice(list(URLTypeEnum)),
             entityId=random.choice(entities).id
         )
@@ -89,4 +94,6 @@ def seed_all():
         urls = seed_urls(session, entities)
         seed_posts(session, urls)
         seed_blog_web_posts(session, urls)
+        rebuild_url_latest_metrics(session)
+        rebuild_entity_metrics(session)
         print("✅ Database seeded successfully.")
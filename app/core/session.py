@@ -1,10 +1,33 @@
-from sqlmodel import Session, SQLModel, create_engine
+import asyncio
+from typing import Any, List
+
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session, SQLModel, create_engine, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.configs import settings
 
 engine = create_engine(str(settings.DATABASE_URL), echo=True)
 
 
+def get_async_database_url(database_url: str) -> URL:
+    """
+    Point a postgres DSN at the asyncpg driver.
+
+    asyncpg rejects libpq's ``sslmode`` query parameter, it takes the same
+    modes as ``ssl``.
+    """
+    url = make_url(database_url)
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(drivername="postgresql+asyncpg", query=query)
+
+
+async_engine = create_async_engine(get_async_database_url(str(settings.DATABASE_URL)), echo=True)
+
+
 def init_db():
     """Initialize the database and create tables."""
     try:
@@ -12,8 +35,22 @@ def init_db():
         from app.models.url import URL
         from app.models.post import Post
         from app.models.blog_web_post import BlogWebPost
+        from app.models.url_latest_metrics import URLLatestMetrics
+        from app.models.url_import_job import URLImportJob
+        from app.models.scrape_outbox import ScrapeOutbox
+        from app.models.url_reanalysis_job import URLReanalysisJob
+        from app.models.entity_metrics import EntityMetrics
+        from app.services.entity_metrics import rebuild_entity_metrics
+        from app.services.url import rebuild_url_latest_metrics
 
         SQLModel.metadata.create_all(engine)
+
+        # Backfill the latest-metrics table the first time it is created
+        with Session(engine) as session:
+            if session.exec(select(URLLatestMetrics.urlId).limit(1)).first() is None:
+                rebuild_url_latest_metrics(session)
+            if session.exec(select(EntityMetrics.entityId).limit(1)).first() is None:
+                rebuild_entity_metrics(session)
     except Exception as e:
         print("Ererer", e)
 
@@ -22,3 +59,23 @@ def get_session():
     """Get a new SQLModel session."""
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """Get a new SQLModel async session."""
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+async def run_concurrently(*statements) -> List[List[Any]]:
+    """
+    Run independent SELECT statements concurrently, each on its own pooled connection.
+
+    An AsyncSession can only run one statement at a time, so every statement
+    gets a short-lived session. Results come back in the order of the statements.
+    """
+    async def run(statement):
+        async with AsyncSession(async_engine) as session:
+            return (await session.exec(statement)).all()
+
+    return list(await asyncio.gather(*(run(statement) for statement in statements)))
@@ -5,8 +5,9 @@ from fastapi.responses import RedirectResponse
 
 from app.api.v1.api import api_router
 from app.core.configs import settings
-from app.core.session import init_db
+from app.core.session import async_engine, init_db
 from app.core.seed_db import seed_all
+from app.services.scrape_outbox import outbox_relay
 import os
 
 
@@ -14,6 +15,8 @@ import os
 async def lifespan(app: FastAPI):
     # Startup logic
     init_db()
+    if settings.OUTBOX_RELAY_ENABLED:
+        await outbox_relay.start()
 
     # logic to fake db data
     # if os.environ.get("ENV") == "local":
@@ -21,6 +24,8 @@ async def lifespan(app: FastAPI):
 
     yield
     # Shutdown logic (optional)
+    await outbox_relay.stop()
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -3,12 +3,12 @@ from typing import Optional
 
 from sqlmodel import Field, SQLModel
 
-from app.utils.date import get_now_for_timezone
+from app.utils.date import get_utc_now
 
 
 class AuditableBaseModel(SQLModel):
     """Base model for all database models."""
 
     created_date: Optional[datetime] = Field(
-        default_factory=get_now_for_timezone,
+        default_factory=get_utc_now,
     )
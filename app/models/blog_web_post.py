@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, ClassVar, Union, Callable, TYPE_CHECKING
 
-from sqlmodel import Field, Column, ForeignKey, Relationship, Integer, SQLModel, Boolean, DateTime
+from sqlmodel import Field, Column, ForeignKey, Index, Relationship, Integer, SQLModel, Boolean, DateTime, text
 
 if TYPE_CHECKING:
     from app.models.url import URL
@@ -9,6 +9,9 @@ if TYPE_CHECKING:
 
 class BlogWebPost(SQLModel, table=True):
     __tablename__: ClassVar[Union[str, Callable[..., str]]] = "blog_web_post"
+    __table_args__ = (
+        Index("ix_blog_web_post_url_id_date_analyzed", "url_id", text("date_analyzed DESC")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     trafficCount: int = Field(sa_column=Column("traffic_count", Integer, default=0))
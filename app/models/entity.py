@@ -1,6 +1,7 @@
+from datetime import datetime
 from typing import Optional, List, ClassVar, Union, Callable, TYPE_CHECKING
 
-from sqlmodel import Field, Relationship
+from sqlmodel import Column, DateTime, Field, Index, Relationship
 
 from app.models.base import AuditableBaseModel
 from app.models.enums.platform import PlatformEnum
@@ -11,12 +12,19 @@ if TYPE_CHECKING:
 
 class Entity(AuditableBaseModel, table=True):
     __tablename__: ClassVar[Union[str, Callable[..., str]]] = "entity"
+    __table_args__ = (
+        Index("ix_entity_platform_username", "platform", "username"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     username: Optional[str] = None
     fullname: Optional[str] = None
     followers: Optional[int] = None
     platform: PlatformEnum
+    # When fullname/followers were last fetched from the platform
+    profileFetchedDate: Optional[datetime] = Field(
+        default=None, sa_column=Column("profile_fetched_date", DateTime, nullable=True)
+    )
 
     # Relationships
     urls: List["URL"] = Relationship(back_populates="entity", sa_relationship_kwargs={"cascade": "all, delete"})
@@ -0,0 +1,33 @@
+from typing import ClassVar, Union, Callable
+
+from sqlmodel import Field, Column, BigInteger, Enum, ForeignKey, Integer, SQLModel
+
+from app.models.enums.platform import PlatformEnum
+
+
+class EntityMetrics(SQLModel, table=True):
+    """
+    Per-entity, per-platform totals over the latest snapshot of every URL of the entity.
+
+    Posts count under the platform of the entity and blog posts under WEBSITE.
+    Kept up to date with deltas whenever a snapshot replaces the latest metrics
+    of a URL, and recomputed by rebuild_entity_metrics.
+    """
+    __tablename__: ClassVar[Union[str, Callable[..., str]]] = "entity_metrics"
+
+    entityId: int = Field(
+        sa_column=Column("entity_id", Integer, ForeignKey("entity.id", ondelete="CASCADE"), primary_key=True)
+    )
+    platform: PlatformEnum = Field(sa_column=Column("platform", Enum(PlatformEnum), primary_key=True))
+    likes: int = Field(default=0, sa_column=Column("likes", BigInteger, nullable=False, server_default="0"))
+    comments: int = Field(default=0, sa_column=Column("comments", BigInteger, nullable=False, server_default="0"))
+    views: int = Field(default=0, sa_column=Column("views", BigInteger, nullable=False, server_default="0"))
+    engagementSum: int = Field(
+        default=0, sa_column=Column("engagement_sum", BigInteger, nullable=False, server_default="0")
+    )
+    snapshotCount: int = Field(
+        default=0, sa_column=Column("snapshot_count", Integer, nullable=False, server_default="0")
+    )
+    brokenOrDeletedCount: int = Field(
+        default=0, sa_column=Column("broken_or_deleted_count", Integer, nullable=False, server_default="0")
+    )
@@ -15,3 +15,30 @@ class URLTypeEnum(str, Enum):
 
     def __str__(self):
         return self.value
+
+
+class URLExportFormatEnum(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+    def __str__(self):
+        return self.value
+
+
+class URLImportStatusEnum(str, Enum):
+    PENDING = "PENDING"
+    RUNNING = "RUNNING"
+    COMPLETED = "COMPLETED"
+    FAILED = "FAILED"
+
+    def __str__(self):
+        return self.value
+
+
+class HistoryBucketEnum(str, Enum):
+    hour = "hour"
+    day = "day"
+    week = "week"
+
+    def __str__(self):
+        return self.value
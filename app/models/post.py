@@ -1,6 +1,6 @@
 from typing import Optional, ClassVar, Union, Callable, TYPE_CHECKING
 
-from sqlmodel import Field, Column, ForeignKey, Relationship, Integer, SQLModel, Boolean, DateTime
+from sqlmodel import Field, Column, ForeignKey, Index, Relationship, Integer, SQLModel, Boolean, DateTime, text
 from datetime import datetime
 
 if TYPE_CHECKING:
@@ -9,6 +9,9 @@ if TYPE_CHECKING:
 
 class Post(SQLModel, table=True):
     __tablename__: ClassVar[Union[str, Callable[..., str]]] = "post"
+    __table_args__ = (
+        Index("ix_post_url_id_date_analyzed", "url_id", text("date_analyzed DESC")),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     comments: int
@@ -0,0 +1,26 @@
+from typing import Optional, Any, Dict, ClassVar, Union, Callable
+
+from sqlmodel import Field, Column, BigInteger, Index, Integer, JSON, String
+
+from app.models.base import AuditableBaseModel
+from app.models.enums.platform import PlatformEnum
+
+
+class ScrapeOutbox(AuditableBaseModel, table=True):
+    """
+    Scrape message waiting to be relayed to the platform SQS queue.
+
+    Written in the same transaction as the URL/snapshot rows it refers to and
+    deleted by the outbox relay once SQS accepted it.
+    """
+    __tablename__: ClassVar[Union[str, Callable[..., str]]] = "scrape_outbox"
+    __table_args__ = (
+        Index("ix_scrape_outbox_job_id", "job_id"),
+    )
+
+    id: Optional[int] = Field(default=None, sa_column=Column("id", BigInteger, primary_key=True, autoincrement=True))
+    platform: PlatformEnum
+    payload: Dict[str, Any] = Field(sa_column=Column("payload", JSON, nullable=False))
+    attempts: int = Field(default=0, sa_column=Column("attempts", Integer, nullable=False, server_default="0"))
+    # URLReanalysisJob that produced the message, if any
+    jobId: Optional[str] = Field(default=None, sa_column=Column("job_id", String(32), nullable=True))
@@ -1,9 +1,10 @@
 from typing import Optional, List, TYPE_CHECKING, Any
 
-from sqlmodel import Field, Column, ForeignKey, Relationship, String
+from sqlmodel import Field, Column, ForeignKey, Index, Relationship, String
 from pydantic import field_validator
 from app.models.base import AuditableBaseModel
 from app.models.enums.url import URLTypeEnum
+from app.utils.canonical_url import CANONICAL_KEY_LENGTH
 
 if TYPE_CHECKING:
     from app.models.entity import Entity
@@ -13,10 +14,20 @@ if TYPE_CHECKING:
 
 class URL(AuditableBaseModel, table=True):
     __tablename__: str = "url"
+    __table_args__ = (
+        Index("ix_url_created_date", "created_date"),
+        Index("ix_url_url", "url", unique=True),
+        Index("ix_url_entity_id", "entity_id"),
+        Index("ix_url_canonical_key", "canonical_key", unique=True),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     url: str
     type: URLTypeEnum
+    # canonical_key(url); NULL only for pre-canonicalization duplicates of an older row
+    canonicalKey: Optional[str] = Field(
+        default=None, sa_column=Column("canonical_key", String(CANONICAL_KEY_LENGTH), nullable=True)
+    )
 
     # Foreign key 
     entityId: int = Field(sa_column=Column("entity_id", ForeignKey("entity.id"), nullable=True))
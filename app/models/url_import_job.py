@@ -0,0 +1,26 @@
+from datetime import datetime
+from typing import Optional, List, ClassVar, Union, Callable
+
+from sqlmodel import Field, Column, DateTime, Integer, JSON
+
+from app.models.base import AuditableBaseModel
+from app.models.enums.url import URLImportStatusEnum
+
+
+class URLImportJob(AuditableBaseModel, table=True):
+    """Progress of a file import started from /url/import, processed in the background."""
+    __tablename__: ClassVar[Union[str, Callable[..., str]]] = "url_import_job"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    filename: Optional[str] = None
+    status: URLImportStatusEnum = URLImportStatusEnum.PENDING
+    totalCount: int = Field(default=0, sa_column=Column("total_count", Integer, nullable=False))
+    processedCount: int = Field(default=0, sa_column=Column("processed_count", Integer, nullable=False))
+    addedCount: int = Field(default=0, sa_column=Column("added_count", Integer, nullable=False))
+    failedCount: int = Field(default=0, sa_column=Column("failed_count", Integer, nullable=False))
+    # Capped at MAX_IMPORT_FAILED_URLS so huge bad files do not bloat the row
+    failedUrls: List[str] = Field(default_factory=list, sa_column=Column("failed_urls", JSON, nullable=False))
+    error: Optional[str] = None
+    completedDate: Optional[datetime] = Field(
+        default=None, sa_column=Column("completed_date", DateTime, nullable=True)
+    )
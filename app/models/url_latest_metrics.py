@@ -0,0 +1,50 @@
+from datetime import date, datetime
+from typing import Optional, ClassVar, Union, Callable
+
+from sqlmodel import Field, Column, ForeignKey, Index, Integer, SQLModel, Boolean, DateTime, Date
+
+from app.models.enums.platform import PlatformEnum
+from app.models.enums.url import URLTypeEnum
+
+
+class URLLatestMetrics(SQLModel, table=True):
+    """
+    One row per URL holding the metrics of its latest Post/BlogWebPost snapshot.
+
+    Upserted on every snapshot write so listing and summary endpoints never
+    have to reduce the full snapshot history.
+    """
+    __tablename__: ClassVar[Union[str, Callable[..., str]]] = "url_latest_metrics"
+    __table_args__ = (
+        # Serves the per-day listing in keyset order: (engagement_rate, date_uploaded, url_id)
+        Index("ix_url_latest_metrics_listing", "upload_date", "engagement_rate", "date_uploaded", "url_id"),
+        Index("ix_url_latest_metrics_entity_id", "entity_id"),
+    )
+
+    urlId: int = Field(
+        sa_column=Column("url_id", Integer, ForeignKey("url.id", ondelete="CASCADE"), primary_key=True)
+    )
+    entityId: Optional[int] = Field(
+        default=None, sa_column=Column("entity_id", Integer, ForeignKey("entity.id"), nullable=True)
+    )
+    url: str
+    type: URLTypeEnum
+    platform: PlatformEnum
+    engagementRate: int = Field(default=0, sa_column=Column("engagement_rate", Integer, nullable=False))
+    # Counters of the snapshot, so replacing it can apply a delta to entity_metrics
+    likes: int = Field(default=0, sa_column=Column("likes", Integer, nullable=False, server_default="0"))
+    comments: int = Field(default=0, sa_column=Column("comments", Integer, nullable=False, server_default="0"))
+    views: int = Field(default=0, sa_column=Column("views", Integer, nullable=False, server_default="0"))
+    isBrokenOrDeleted: Optional[bool] = Field(
+        default=False, sa_column=Column("is_broken_or_deleted", Boolean)
+    )
+    isFetched: Optional[bool] = Field(
+        default=False, sa_column=Column("is_fetched", Boolean)
+    )
+    dateAnalysed: datetime = Field(
+        sa_column=Column("date_analyzed", DateTime, nullable=False)
+    )
+
+    # Copied from URL.created_date; uploadDate is the IST calendar day used by the date filters
+    dateUploaded: datetime = Field(sa_column=Column("date_uploaded", DateTime, nullable=False))
+    uploadDate: date = Field(sa_column=Column("upload_date", Date, nullable=False))
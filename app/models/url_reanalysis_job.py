@@ -0,0 +1,15 @@
+from typing import Any, Dict, ClassVar, Union, Callable
+
+from sqlmodel import Field, Column, Integer, JSON, String
+
+from app.models.base import AuditableBaseModel
+from app.utils.hash import get_rand_hash
+
+
+class URLReanalysisJob(AuditableBaseModel, table=True):
+    """A bulk re-analysis request; its scrape messages carry the job id in scrape_outbox."""
+    __tablename__: ClassVar[Union[str, Callable[..., str]]] = "url_reanalysis_job"
+
+    id: str = Field(default_factory=lambda: get_rand_hash(32), sa_column=Column("id", String(32), primary_key=True))
+    filters: Dict[str, Any] = Field(sa_column=Column("filters", JSON, nullable=False))
+    matchedCount: int = Field(default=0, sa_column=Column("matched_count", Integer, nullable=False))
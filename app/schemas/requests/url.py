@@ -0,0 +1,72 @@
+from datetime import date, datetime, timezone
+from typing import Optional, List
+
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from app.models.enums.platform import PlatformEnum
+
+MAX_REANALYZE_URL_IDS = 10000
+MAX_INGEST_SNAPSHOTS = 10000
+
+
+class BulkReanalyzeRequest(BaseModel):
+    """Filters selecting the URLs to re-analyze. All given filters must match, at least one is required."""
+    platform: Optional[PlatformEnum] = None
+    date_from: Optional[date] = Field(None, description="First IST upload date (YYYY-MM-DD)")
+    date_to: Optional[date] = Field(None, description="Last IST upload date (YYYY-MM-DD)")
+    is_broken_or_deleted: Optional[bool] = None
+    is_fetched: Optional[bool] = None
+    url_ids: Optional[List[int]] = Field(None, max_length=MAX_REANALYZE_URL_IDS)
+
+    @model_validator(mode="after")
+    def check_filters(self):
+        if not self.url_ids and all(getattr(self, name) is None for name in self.model_fields if name != "url_ids"):
+            raise ValueError("At least one filter is required")
+        if self.date_from and self.date_to and self.date_from > self.date_to:
+            raise ValueError("date_from must not be after date_to")
+        return self
+
+
+def to_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    # Timestamps are stored as naive UTC
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class SnapshotOwner(BaseModel):
+    """Profile that published the URL, upserted by (platform, username)."""
+    username: str = Field(..., min_length=1)
+    fullname: Optional[str] = None
+    followers: Optional[int] = None
+    fetched_date: Optional[datetime] = Field(
+        None, description="When fullname/followers were fetched; older profiles do not overwrite newer ones"
+    )
+
+    _fetched_date_to_naive_utc = field_validator("fetched_date")(to_naive_utc)
+
+
+class SnapshotIngestItem(BaseModel):
+    """
+    One scrape result. Stored as a Post or BlogWebPost depending on the URL type;
+    likes/comments/views apply to posts and traffic_count to blog posts.
+    """
+    url_id: int
+    snapshot_id: Optional[int] = Field(
+        None, description="post_id/web_id of the scrape message; that snapshot is updated instead of adding one"
+    )
+    likes: int = 0
+    comments: int = 0
+    views: Optional[int] = None
+    traffic_count: int = 0
+    engagement_rate: int = 0
+    date_analyzed: datetime
+    is_broken_or_deleted: bool = False
+    is_fetched: bool = True
+    owner: Optional[SnapshotOwner] = None
+
+    _date_analyzed_to_naive_utc = field_validator("date_analyzed")(to_naive_utc)
+
+
+class SnapshotIngestRequest(BaseModel):
+    snapshots: List[SnapshotIngestItem] = Field(..., min_length=1, max_length=MAX_INGEST_SNAPSHOTS)
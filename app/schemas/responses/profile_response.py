@@ -41,6 +41,7 @@ class ProfileMetricsResponse(BaseModel):
     top_performer: Optional[TopPerformer]
     most_used_platform: Optional[PlatformEnum]
     profile_onboarded: ProfileOnboarded
+    next_cursor: Optional[str] = None
 
 
 class ProfileAnalysis(BaseModel):
@@ -4,7 +4,7 @@ from typing import Optional, List
 from pydantic import BaseModel
 
 from app.models.enums.platform import PlatformEnum
-from app.models.enums.url import URLTypeEnum
+from app.models.enums.url import URLImportStatusEnum, URLTypeEnum
 
 
 class SimpleSuccessResponse(BaseModel):
@@ -28,6 +28,7 @@ class URLDetailResponse(BaseModel):
 
 class URLListingResponse(BaseModel):
     urls: List[URLDetailResponse]
+    next_cursor: Optional[str] = None
 
 class TopPerformingURL(BaseModel):
     url_id: int
@@ -44,6 +45,14 @@ class OverallURLSummaryResponse(BaseModel):
     top_performer: Optional[TopPerformingURL]
 
 
+class DailyURLSummaryResponse(OverallURLSummaryResponse):
+    date_uploaded: date
+
+
+class URLSummaryRangeResponse(BaseModel):
+    days: List[DailyURLSummaryResponse]
+
+
 class EngagementSnapshot(BaseModel):
     date_analysed: datetime
     likes: Optional[int]
@@ -66,8 +75,14 @@ class URLAnalysisSummaryResponse(BaseModel):
     is_broken_or_deleted: bool
     is_fetched: bool
 
+class URLAnalysisBulkResponse(BaseModel):
+    items: List[URLAnalysisSummaryResponse]
+    missing_url_ids: List[int]
+
+
 class URLAnalysisHistoryResponse(BaseModel):
     date_analyzed: date
+    bucket_start: Optional[datetime] = None  # Start of the hour/day/week bucket when bucketed
     likes: Optional[int] = None
     views: Optional[int] = None
     comments: Optional[int] = None
@@ -92,3 +107,33 @@ class URLUploadResponse(BaseModel):
     message: str
     added_count: int
     failed_urls: List[str]
+
+
+class URLImportJobResponse(BaseModel):
+    job_id: int
+    filename: Optional[str] = None
+    status: URLImportStatusEnum
+    total_count: int
+    processed_count: int
+    added_count: int
+    failed_count: int
+    failed_urls: List[str]
+    error: Optional[str] = None
+    created_date: datetime
+    completed_date: Optional[datetime] = None
+
+
+class URLReanalysisJobResponse(BaseModel):
+    job_id: str
+    matched_count: int
+    pending_count: int  # Messages not yet accepted by SQS
+    failed_count: int  # Messages that gave up after OUTBOX_MAX_ATTEMPTS
+    filters: dict
+    created_date: datetime
+
+
+class SnapshotIngestResponse(BaseModel):
+    inserted_count: int
+    updated_count: int  # Placeholder snapshots filled in place
+    created_entity_count: int
+    missing_url_ids: List[int]
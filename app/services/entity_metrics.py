@@ -0,0 +1,109 @@
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import delete, literal
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, case, func, select, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.entity_metrics import EntityMetrics
+from app.models.enums.platform import PlatformEnum
+from app.models.enums.url import URLTypeEnum
+from app.models.url_latest_metrics import URLLatestMetrics
+
+ENTITY_METRICS_COUNTERS = (
+    "likes", "comments", "views", "engagement_sum", "snapshot_count", "broken_or_deleted_count"
+)
+
+# url_latest_metrics columns a URL contributes to entity_metrics with
+CONTRIBUTION_COLUMNS = (
+    URLLatestMetrics.urlId, URLLatestMetrics.entityId, URLLatestMetrics.type, URLLatestMetrics.platform,
+    URLLatestMetrics.likes, URLLatestMetrics.comments, URLLatestMetrics.views,
+    URLLatestMetrics.engagementRate, URLLatestMetrics.isBrokenOrDeleted,
+)
+
+
+def entity_metrics_platform(url_type: URLTypeEnum, platform: PlatformEnum) -> PlatformEnum:
+    """Posts count under the platform of their entity, blog posts under WEBSITE."""
+    return PlatformEnum.WEBSITE if url_type == URLTypeEnum.WEB_POST else PlatformEnum(platform)
+
+
+def entity_metrics_deltas(previous: List[Any], replaced: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Changes to entity_metrics when the ``previous`` latest metrics of URLs are ``replaced``.
+
+    Both lists hold CONTRIBUTION_COLUMNS rows; previous rows of URLs that were not
+    replaced are ignored. Deltas are summed per (entity, platform) and sorted, so
+    concurrent writers lock entity_metrics rows in the same order.
+    """
+    replaced_ids = {row.urlId for row in replaced}
+    totals: Dict[Tuple[int, PlatformEnum], Dict[str, int]] = {}
+    for rows, sign in ((replaced, 1), ([row for row in previous if row.urlId in replaced_ids], -1)):
+        for row in rows:
+            if row.entityId is None:
+                continue
+            delta = totals.setdefault(
+                (row.entityId, entity_metrics_platform(row.type, row.platform)),
+                dict.fromkeys(ENTITY_METRICS_COUNTERS, 0)
+            )
+            delta["likes"] += sign * row.likes
+            delta["comments"] += sign * row.comments
+            delta["views"] += sign * row.views
+            delta["engagement_sum"] += sign * row.engagementRate
+            delta["snapshot_count"] += sign
+            delta["broken_or_deleted_count"] += sign * bool(row.isBrokenOrDeleted)
+
+    return [
+        {"entity_id": entity_id, "platform": platform, **delta}
+        for (entity_id, platform), delta in sorted(totals.items())
+        if any(delta.values())
+    ]
+
+
+def entity_metrics_upsert(rows: List[Dict[str, Any]]):
+    """Build the upsert adding delta rows to the entity_metrics totals."""
+    stmt = insert(EntityMetrics).values(rows)
+    columns = EntityMetrics.__table__.c
+    return stmt.on_conflict_do_update(
+        index_elements=[EntityMetrics.entityId, EntityMetrics.platform],
+        set_={column: columns[column] + stmt.excluded[column] for column in ENTITY_METRICS_COUNTERS},
+    )
+
+
+async def apply_entity_metrics_deltas(db: AsyncSession, previous: List[Any], replaced: List[Any]) -> None:
+    """Apply the deltas of replaced latest metrics in the caller's transaction."""
+    deltas = entity_metrics_deltas(previous, replaced)
+    if deltas:
+        await db.exec(entity_metrics_upsert(deltas))
+
+
+def rebuild_entity_metrics(db: Session) -> None:
+    """
+    Recompute entity_metrics from url_latest_metrics.
+
+    The table is locked against concurrent deltas until the rebuild commits, so
+    writes that land meanwhile are applied on top of the rebuilt totals.
+    """
+    platform = case(
+        (URLLatestMetrics.type == URLTypeEnum.WEB_POST,
+         literal(PlatformEnum.WEBSITE, URLLatestMetrics.__table__.c.platform.type)),
+        else_=URLLatestMetrics.platform
+    )
+    totals = (
+        select(
+            URLLatestMetrics.entityId,
+            platform,
+            func.sum(URLLatestMetrics.likes),
+            func.sum(URLLatestMetrics.comments),
+            func.sum(URLLatestMetrics.views),
+            func.sum(URLLatestMetrics.engagementRate),
+            func.count(),
+            func.count().filter(URLLatestMetrics.isBrokenOrDeleted.is_(True)),
+        )
+        .where(URLLatestMetrics.entityId.is_not(None))
+        .group_by(URLLatestMetrics.entityId, platform)
+    )
+
+    db.exec(text("LOCK TABLE entity_metrics IN EXCLUSIVE MODE"))
+    db.exec(delete(EntityMetrics))
+    db.exec(insert(EntityMetrics).from_select(["entity_id", "platform", *ENTITY_METRICS_COUNTERS], totals))
+    db.commit()
@@ -0,0 +1,79 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+from app.models.enums.platform import PlatformEnum
+
+# Registrable domains of every supported platform. A host matches a rule when it
+# is the domain itself or any subdomain of it (m., web., business., ...).
+PLATFORM_DOMAIN_RULES: Dict[str, PlatformEnum] = {
+    "facebook.com": PlatformEnum.FACEBOOK,
+    "fb.com": PlatformEnum.FACEBOOK,
+    "fb.watch": PlatformEnum.FACEBOOK,
+    "fb.me": PlatformEnum.FACEBOOK,
+    "instagram.com": PlatformEnum.INSTAGRAM,
+    "instagr.am": PlatformEnum.INSTAGRAM,
+    "ig.me": PlatformEnum.INSTAGRAM,
+    "youtube.com": PlatformEnum.YOUTUBE,
+    "youtu.be": PlatformEnum.YOUTUBE,
+    "youtube-nocookie.com": PlatformEnum.YOUTUBE,
+}
+
+
+# Scheme, userinfo and the host up to its port, path, query or fragment
+HOST_PATTERN = re.compile(r"^\s*(?:[A-Za-z][A-Za-z0-9+.-]*://)?(?:[^@/?#]*@)?([^:/?#]*)")
+
+
+def extract_host(url: str) -> str:
+    """Lowercased host of a URL, without userinfo, port or trailing dot."""
+    return HOST_PATTERN.match(url).group(1).rstrip(".").lower()
+
+
+class PlatformClassifier:
+    """
+    Maps URLs to platforms through a trie of reversed domain labels.
+
+    Classifying walks the host labels from the TLD inwards and keeps the deepest
+    rule reached, so lookups cost one dict access per label whatever the number
+    of rules. Hosts matching no rule are WEBSITE.
+    """
+
+    # Not a possible label, so it can sit next to the child labels of a node
+    PLATFORM_KEY = None
+
+    def __init__(self, rules: Dict[str, PlatformEnum], default: PlatformEnum = PlatformEnum.WEBSITE):
+        self.default = default.value
+        self._trie: Dict[Optional[str], dict] = {}
+        for domain, platform in rules.items():
+            node = self._trie
+            for label in reversed(domain.lower().split(".")):
+                node = node.setdefault(label, {})
+            node[self.PLATFORM_KEY] = platform.value
+
+    def classify_host(self, host: str) -> str:
+        node = self._trie
+        platform: Optional[str] = None
+        for label in reversed(host.split(".")):
+            node = node.get(label)
+            if node is None:
+                break
+            platform = node.get(self.PLATFORM_KEY, platform)
+        return platform or self.default
+
+    def classify(self, url: str) -> str:
+        """Platform value of a single URL."""
+        return self.classify_host(extract_host(url))
+
+    def classify_many(self, urls: Iterable[str]) -> List[str]:
+        """Classify a batch of URLs, walking the trie once per distinct host."""
+        by_host: Dict[str, str] = {}
+        platforms = []
+        for url in urls:
+            host = extract_host(url)
+            platform = by_host.get(host)
+            if platform is None:
+                platform = by_host[host] = self.classify_host(host)
+            platforms.append(platform)
+        return platforms
+
+
+platform_classifier = PlatformClassifier(PLATFORM_DOMAIN_RULES)
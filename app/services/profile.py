@@ -0,0 +1,266 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from sqlmodel import Numeric, String, cast, func, literal, select, tuple_, union_all
+
+from app.models.blog_web_post import BlogWebPost
+from app.models.entity import Entity
+from app.models.entity_metrics import EntityMetrics
+from app.models.enums.platform import PlatformEnum
+from app.models.enums.profile import ProfileSortBy
+from app.models.enums.url import URLTypeEnum
+from app.models.post import Post
+from app.models.url import URL
+from app.models.url_latest_metrics import URLLatestMetrics
+from app.services.entity_metrics import entity_metrics_platform
+from app.utils.pagination import decode_cursor, encode_cursor
+
+# Keyset of each sort, all descending. own_platform puts the posts of an entity
+# before its blog posts; created_date is NULL-safe so it can be compared.
+PROFILE_SORT_KEYS = {
+    ProfileSortBy.created_desc: ("created_sort", "id", "own_platform"),
+    ProfileSortBy.engagement_rate_desc: ("total_engagement_rate", "id", "own_platform"),
+}
+
+
+def profile_metrics_subquery():
+    """One row per (entity, platform) with snapshots, read from entity_metrics."""
+    return (
+        select(
+            Entity.id,
+            Entity.username,
+            Entity.fullname,
+            Entity.followers,
+            Entity.created_date,
+            func.coalesce(Entity.created_date, datetime.min).label("created_sort"),
+            cast(EntityMetrics.platform, String).label("platform"),
+            (EntityMetrics.platform != PlatformEnum.WEBSITE).label("own_platform"),
+            EntityMetrics.likes.label("total_likes"),
+            EntityMetrics.comments.label("total_comments"),
+            EntityMetrics.views.label("total_views"),
+            func.round(cast(EntityMetrics.engagementSum, Numeric) / EntityMetrics.snapshotCount, 2)
+            .label("total_engagement_rate"),
+            EntityMetrics.brokenOrDeletedCount.label("broken_or_deleted_count"),
+        )
+        .join(EntityMetrics, EntityMetrics.entityId == Entity.id)
+        .where(EntityMetrics.snapshotCount > 0)
+        .subquery("profile_metrics")
+    )
+
+
+def decode_profile_cursor(cursor: str, sort_by: ProfileSortBy) -> tuple:
+    """
+    Keyset values of a /profile/profile-metrics cursor.
+
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        first, entity_id, own_platform = decode_cursor(cursor, 3)
+        first = Decimal(first) if sort_by == ProfileSortBy.engagement_rate_desc else datetime.fromisoformat(first)
+        return first, int(entity_id), bool(own_platform)
+    except (ArithmeticError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def profile_metrics_page_query(platform: str = "all", sort_by: ProfileSortBy = ProfileSortBy.created_desc,
+                               limit: int = 100, cursor: Optional[str] = None):
+    """
+    One page of profile metrics, filtered by platform and sorted in SQL.
+
+    Fetches limit + 1 rows so the caller can tell whether there is a next page.
+
+    :raises ValueError: If the cursor is malformed.
+    """
+    metrics = profile_metrics_subquery()
+    keyset = [metrics.c[column] for column in PROFILE_SORT_KEYS[sort_by]]
+
+    query = select(*metrics.c)
+    if platform.lower() != "all":
+        query = query.where(metrics.c.platform == platform.upper())
+    if cursor:
+        query = query.where(tuple_(*keyset) < decode_profile_cursor(cursor, sort_by))
+    return query.order_by(*(column.desc() for column in keyset)).limit(limit + 1)
+
+
+def profile_metrics_next_cursor(last: Any, sort_by: ProfileSortBy) -> str:
+    return encode_cursor([getattr(last, column) for column in PROFILE_SORT_KEYS[sort_by]])
+
+
+def profile_summary_queries() -> tuple:
+    """
+    The top performer, the most used platform and the onboarding counts over all profiles.
+
+    Independent of the page, platform filter and sort of the listing.
+    """
+    metrics = profile_metrics_subquery()
+    top_performer = (
+        select(metrics.c.id, metrics.c.username, metrics.c.fullname, metrics.c.platform,
+               metrics.c.total_engagement_rate.label("average_engagement_rate"))
+        .order_by(metrics.c.total_engagement_rate.desc(), metrics.c.id, metrics.c.own_platform.desc())
+        .limit(1)
+    )
+    platform_usage = (
+        select(metrics.c.platform, func.count().label("count"))
+        .group_by(metrics.c.platform)
+        .order_by(func.count().desc(), metrics.c.platform)
+        .limit(1)
+    )
+    onboarded = select(Entity.platform, func.count().label("count")).group_by(Entity.platform)
+    return top_performer, platform_usage, onboarded
+
+
+def profile_metrics_record(row: Any) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "username": row.username,
+        "fullname": row.fullname,
+        "platform": row.platform,
+        "followers": row.followers,
+        "created_date": row.created_date,
+        "total_likes": row.total_likes,
+        "total_comments": row.total_comments,
+        "total_views": row.total_views,
+        "total_engagement_rate": float(row.total_engagement_rate),
+        "broken_or_deleted_count": row.broken_or_deleted_count,
+    }
+
+
+def build_profile_metrics(rows: List[Any], top_performer_rows: List[Any], platform_usage_rows: List[Any],
+                          onboarded_rows: List[Any], next_cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Assemble the /profile/profile-metrics payload from a page and the profile_summary_queries results."""
+    top_performer = None
+    if top_performer_rows:
+        top = top_performer_rows[0]
+        top_performer = {
+            "id": top.id,
+            "username": top.username,
+            "fullname": top.fullname,
+            "platform": top.platform,
+            "average_engagement_rate": float(top.average_engagement_rate),
+        }
+
+    onboard_counter = {row.platform.value: row.count for row in onboarded_rows}
+    total_profiles = sum(onboard_counter.values())
+    platform_distribution = {
+        plat.value: {
+            "count": onboard_counter.get(plat.value, 0),
+            "percentage": round((onboard_counter.get(plat.value, 0) / total_profiles) * 100, 2)
+            if total_profiles > 0 else 0
+        }
+        for plat in PlatformEnum
+    }
+
+    return {
+        "profiles": [profile_metrics_record(row) for row in rows],
+        "top_performer": top_performer,
+        "most_used_platform": platform_usage_rows[0].platform if platform_usage_rows else None,
+        "profile_onboarded": {
+            "total_profiles": total_profiles,
+            "platform_distribution": platform_distribution
+        },
+        "next_cursor": next_cursor,
+    }
+
+
+def window_snapshots_cte(entity_id: int, analysed_from: Optional[datetime], analysed_to: Optional[datetime]):
+    """
+    Latest snapshot analysed inside the window for every URL of the entity.
+
+    Each branch reads the (url_id, date_analyzed) index of its snapshot table
+    for the URLs of the entity only, so history outside the window is never read.
+    """
+    branches = []
+    for model, url_type, counters in (
+        (Post, URLTypeEnum.POST, (Post.likes, Post.comments, func.coalesce(Post.views, 0))),
+        (BlogWebPost, URLTypeEnum.WEB_POST, (literal(0), literal(0), func.coalesce(BlogWebPost.trafficCount, 0))),
+    ):
+        conditions = [URL.entityId == entity_id]
+        if analysed_from:
+            conditions.append(model.dateAnalysed >= analysed_from)
+        if analysed_to:
+            conditions.append(model.dateAnalysed <= analysed_to)
+        likes, comments, views = counters
+        branches.append(
+            select(
+                model.urlId.label("url_id"), URL.url.label("url"),
+                literal(url_type.value).label("type"),
+                likes.label("likes"), comments.label("comments"), views.label("views"),
+                model.engagementRate.label("engagement_rate"),
+            )
+            .join(URL, URL.id == model.urlId)
+            .where(*conditions)
+            .distinct(model.urlId)
+            .order_by(model.urlId, model.dateAnalysed.desc())
+        )
+    return union_all(*branches).cte("window_snapshot")
+
+
+def profile_analysis_queries(entity_id: int, analysed_from: Optional[datetime] = None,
+                             analysed_to: Optional[datetime] = None, limit: int = 100) -> tuple:
+    """
+    The entity, its totals and its top URLs by latest engagement rate.
+
+    Without a window the totals come from entity_metrics and the URLs from
+    url_latest_metrics. With one, both are computed from the latest snapshot
+    per URL inside it.
+    """
+    if analysed_from is None and analysed_to is None:
+        totals = select(
+            func.coalesce(func.sum(EntityMetrics.likes), 0).label("likes"),
+            func.coalesce(func.sum(EntityMetrics.comments), 0).label("comments"),
+            func.coalesce(func.sum(EntityMetrics.views), 0).label("views"),
+            func.coalesce(func.sum(EntityMetrics.engagementSum), 0).label("engagement_sum"),
+            func.coalesce(func.sum(EntityMetrics.snapshotCount), 0).label("snapshot_count"),
+        ).where(EntityMetrics.entityId == entity_id)
+        comparison = (
+            select(URLLatestMetrics.urlId.label("url_id"), URLLatestMetrics.url, URLLatestMetrics.type,
+                   URLLatestMetrics.engagementRate.label("engagement_rate"))
+            .where(URLLatestMetrics.entityId == entity_id)
+            .order_by(URLLatestMetrics.engagementRate.desc(), URLLatestMetrics.urlId)
+            .limit(limit)
+        )
+    else:
+        snapshot = window_snapshots_cte(entity_id, analysed_from, analysed_to)
+        totals = select(
+            func.coalesce(func.sum(snapshot.c.likes), 0).label("likes"),
+            func.coalesce(func.sum(snapshot.c.comments), 0).label("comments"),
+            func.coalesce(func.sum(snapshot.c.views), 0).label("views"),
+            func.coalesce(func.sum(snapshot.c.engagement_rate), 0).label("engagement_sum"),
+            func.count().label("snapshot_count"),
+        )
+        comparison = (
+            select(snapshot.c.url_id, snapshot.c.url, snapshot.c.type, snapshot.c.engagement_rate)
+            .order_by(snapshot.c.engagement_rate.desc(), snapshot.c.url_id)
+            .limit(limit)
+        )
+
+    return select(Entity).where(Entity.id == entity_id), totals, comparison
+
+
+def build_profile_analysis(entity: Entity, totals: Any, comparison_rows: List[Any]) -> Dict[str, Any]:
+    """Assemble the /profile/analytics payload from the results of profile_analysis_queries."""
+    avg_engagement_rate = (
+        round(totals.engagement_sum / totals.snapshot_count, 2) if totals.snapshot_count > 0 else 0
+    )
+    return {
+        "id": entity.id,
+        "username": entity.username,
+        "fullname": entity.fullname,
+        "platform": entity.platform.value,
+        "profile_analysis": {
+            "avg_engagement_rate": avg_engagement_rate,
+            "total_views": totals.views,
+            "total_comments": totals.comments,
+            "total_likes": totals.likes
+        },
+        "comparison_analysis": [
+            {
+                "id": row.url_id,
+                "url": row.url,
+                "platform": entity_metrics_platform(row.type, entity.platform).value,
+                "engagement_rate": row.engagement_rate
+            }
+            for row in comparison_rows
+        ]
+    }
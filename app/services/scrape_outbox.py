@@ -0,0 +1,163 @@
+import asyncio
+import json
+from typing import List, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.configs import settings
+from app.core.session import async_engine
+from app.models.scrape_outbox import ScrapeOutbox
+from app.schemas.responses.url import URLSuccessItem
+from app.utils.date import get_utc_now
+from app.utils.decorators.singleton import singleton
+from app.utils.sqs import QUEUE_MAP, sqs_publisher
+
+# Keeps multi-row INSERTs well under the 32767 bind parameter limit of PostgreSQL
+OUTBOX_INSERT_BATCH_SIZE = 5000
+
+
+async def enqueue_scrape_jobs(db: AsyncSession, success_urls: List[URLSuccessItem],
+                              job_id: Optional[str] = None) -> None:
+    """
+    Add scrape messages to the outbox in the caller's transaction.
+
+    Nothing is sent until the transaction commits and the relay picks the rows up,
+    so a crash after the commit can no longer lose the message.
+    """
+    now = get_utc_now()
+    rows = [
+        {"platform": item.platform, "payload": item.dict(), "attempts": 0, "job_id": job_id, "created_date": now}
+        for item in success_urls
+        if item.platform.upper() in QUEUE_MAP
+    ]
+    for i in range(0, len(rows), OUTBOX_INSERT_BATCH_SIZE):
+        await db.exec(insert(ScrapeOutbox).values(rows[i:i + OUTBOX_INSERT_BATCH_SIZE]))
+
+
+async def relay_outbox_batch(db: AsyncSession, batch_size: int) -> int:
+    """
+    Send one batch of pending outbox rows to SQS and delete the delivered ones.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED, so relays in other processes
+    take the next rows instead of waiting. Undelivered rows get their attempts
+    bumped and are retried until OUTBOX_MAX_ATTEMPTS; rows reaching it are
+    logged and kept, out of the relay, until their attempts are reset.
+
+    :return: Number of rows claimed.
+    """
+    rows = (await db.exec(
+        select(ScrapeOutbox.id, ScrapeOutbox.platform, ScrapeOutbox.payload)
+        .where(ScrapeOutbox.attempts < settings.OUTBOX_MAX_ATTEMPTS)
+        .order_by(ScrapeOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )).all()
+    if not rows:
+        await db.commit()
+        return 0
+
+    # Row ids are the batch entry ids, so identical payloads are told apart
+    undelivered = set(await sqs_publisher.send({
+        str(row.id): (QUEUE_MAP[row.platform.upper()], json.dumps(row.payload)) for row in rows
+    }))
+    failed_ids = [row.id for row in rows if str(row.id) in undelivered]
+    delivered_ids = [row.id for row in rows if str(row.id) not in undelivered]
+
+    if delivered_ids:
+        await db.exec(delete(ScrapeOutbox).where(ScrapeOutbox.id.in_(delivered_ids)))
+    bumped = []
+    if failed_ids:
+        bumped = (await db.exec(
+            update(ScrapeOutbox)
+            .where(ScrapeOutbox.id.in_(failed_ids))
+            .values(attempts=ScrapeOutbox.attempts + 1)
+            .returning(ScrapeOutbox.id, ScrapeOutbox.jobId, ScrapeOutbox.payload, ScrapeOutbox.attempts)
+        )).all()
+    await db.commit()
+
+    for row in bumped:
+        if row.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+            print(f"Outbox message {row.id} (job {row.jobId}) gave up after {row.attempts} attempts, "
+                  f"it stays in scrape_outbox until an operator resets its attempts: {row.payload}")
+    return len(rows)
+
+
+async def get_outbox_job_counts(db: AsyncSession, job_id: str) -> Tuple[int, int]:
+    """
+    :return: Messages of a job still waiting for SQS, and those that exhausted OUTBOX_MAX_ATTEMPTS.
+    """
+    exhausted = ScrapeOutbox.attempts >= settings.OUTBOX_MAX_ATTEMPTS
+    pending, failed = (await db.exec(
+        select(func.count().filter(~exhausted), func.count().filter(exhausted)).where(ScrapeOutbox.jobId == job_id)
+    )).one()
+    return pending, failed
+
+
+@singleton
+class OutboxRelay:
+    """
+    Background task draining scrape_outbox to SQS.
+
+    Drains batches back to back while rows are pending, then waits for
+    OUTBOX_RELAY_POLL_INTERVAL_SECONDS or a ``wake()`` from a request that just
+    committed outbox rows. Any number of relays can run against the same table.
+    """
+
+    def __init__(self):
+        self.batch_size = settings.OUTBOX_RELAY_BATCH_SIZE
+        self.poll_interval = settings.OUTBOX_RELAY_POLL_INTERVAL_SECONDS
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._worker = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """Finish the batch in flight, then stop the worker."""
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._worker
+        self._worker = None
+
+    def wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def drain(self) -> None:
+        """Relay batches until fewer than batch_size rows are pending."""
+        while not self._stopping:
+            async with AsyncSession(async_engine, expire_on_commit=False) as db:
+                claimed = await relay_outbox_batch(db, self.batch_size)
+            if claimed < self.batch_size:
+                return
+
+    async def run(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            except Exception as e:
+                print(f"Outbox relay failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+outbox_relay = OutboxRelay()
@@ -0,0 +1,331 @@
+from typing import Any, Dict, List, Tuple, Union
+
+from sqlalchemy import (
+    Boolean, Column, DateTime, Integer, MetaData, String, Table, bindparam, cast, exists, or_, update, values
+)
+from sqlalchemy import column as sa_column
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.schema import CreateTable
+from sqlmodel import func, select, tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.blog_web_post import BlogWebPost
+from app.models.entity import Entity
+from app.models.enums.platform import PlatformEnum
+from app.models.enums.url import URLTypeEnum
+from app.models.post import Post
+from app.models.url import URL
+from app.models.url_latest_metrics import URLLatestMetrics
+from app.schemas.requests.url import SnapshotIngestItem
+from app.schemas.responses.url import SnapshotIngestResponse
+from app.services.entity_metrics import CONTRIBUTION_COLUMNS, apply_entity_metrics_deltas
+from app.services.platform_classifier import platform_classifier
+from app.services.url import (
+    BULK_INSERT_BATCH_SIZE, chunked, detect_platform, latest_metrics_values, upsert_url_latest_metrics, url_ids_param
+)
+from app.utils.date import get_utc_now
+
+# Session-local staging table the batch is COPYed into, dropped with the transaction
+SNAPSHOT_STAGING = Table(
+    "snapshot_ingest", MetaData(),
+    Column("url_id", Integer, nullable=False),
+    Column("url_type", String, nullable=False),
+    Column("snapshot_id", Integer),
+    Column("likes", Integer, nullable=False),
+    Column("comments", Integer, nullable=False),
+    Column("views", Integer),
+    Column("traffic_count", Integer, nullable=False),
+    Column("engagement_rate", Integer, nullable=False),
+    Column("date_analyzed", DateTime, nullable=False),
+    Column("is_broken_or_deleted", Boolean, nullable=False),
+    Column("is_fetched", Boolean, nullable=False),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP",
+)
+
+OwnerKey = Tuple[PlatformEnum, str]
+
+
+async def upsert_snapshot_owners(db: AsyncSession, items: List[SnapshotIngestItem],
+                                 urls: Dict[int, Any]) -> Tuple[Dict[int, Tuple[int, PlatformEnum]], int]:
+    """
+    Upsert the owners of the snapshots by (platform, username) and link their URLs to them.
+
+    Entity has no unique key to upsert on, so creating an entity takes a
+    transaction-level advisory lock on its key (in sorted order) and looks it up
+    again first; existing entities only get their fullname/followers refreshed,
+    unless the stored profile was fetched more recently.
+
+    :return: Entity id and platform per owned URL, and the number of entities created.
+    """
+    owned = [item for item in items if item.owner]
+    if not owned:
+        return {}, 0
+
+    owners: Dict[OwnerKey, Any] = {}
+    url_owners: Dict[int, OwnerKey] = {}
+    for item, platform in zip(owned, platform_classifier.classify_many([urls[item.url_id].url for item in owned])):
+        key = (PlatformEnum(platform), item.owner.username)
+        # The most recently fetched profile of an owner wins
+        known = owners.get(key)
+        if known is None or not (known.fetched_date and item.owner.fetched_date
+                                 and known.fetched_date > item.owner.fetched_date):
+            owners[key] = item.owner
+        url_owners[item.url_id] = key
+
+    async def find_entities(keys: List[OwnerKey]) -> Dict[OwnerKey, int]:
+        # Oldest entity wins when earlier data holds duplicates
+        rows = (await db.exec(
+            select(Entity.id, Entity.platform, Entity.username)
+            .where(tuple_(Entity.platform, Entity.username).in_(keys))
+            .distinct(Entity.platform, Entity.username)
+            .order_by(Entity.platform, Entity.username, Entity.id)
+        )).all()
+        return {(row.platform, row.username): row.id for row in rows}
+
+    entity_ids = await find_entities(list(owners))
+    missing = sorted(key for key in owners if key not in entity_ids)
+    created_keys = set()
+    if missing:
+        lock_keys = select(func.unnest(bindparam(
+            "lock_keys", [f"{platform.value}:{username}" for platform, username in missing], type_=ARRAY(String)
+        )).label("key")).subquery()
+        await db.exec(select(func.pg_advisory_xact_lock(func.hashtextextended(lock_keys.c.key, 0))))
+
+        entity_ids.update(await find_entities(missing))
+        to_create = [key for key in missing if key not in entity_ids]
+        now = get_utc_now()
+        for batch in chunked(to_create, BULK_INSERT_BATCH_SIZE):
+            rows = (await db.exec(
+                insert(Entity)
+                .values([
+                    {"platform": platform, "username": username, "fullname": owners[(platform, username)].fullname,
+                     "followers": owners[(platform, username)].followers,
+                     "profile_fetched_date": owners[(platform, username)].fetched_date, "created_date": now}
+                    for platform, username in batch
+                ])
+                .returning(Entity.id, Entity.platform, Entity.username)
+            )).all()
+            entity_ids.update(((row.platform, row.username), row.id) for row in rows)
+            created_keys.update((row.platform, row.username) for row in rows)
+
+    refreshed = sorted(
+        (entity_id, owners[key].fullname, owners[key].followers, owners[key].fetched_date)
+        for key, entity_id in entity_ids.items()
+        if key not in created_keys and (owners[key].fullname is not None or owners[key].followers is not None)
+    )
+    for batch in chunked(refreshed, BULK_INSERT_BATCH_SIZE):
+        owner = values(
+            sa_column("id", Integer), sa_column("fullname", String), sa_column("followers", Integer),
+            sa_column("fetched_date", DateTime), name="owner"
+        ).data(batch)
+        fetched_date = cast(owner.c.fetched_date, DateTime)
+        await db.exec(
+            update(Entity)
+            .where(Entity.id == owner.c.id)
+            # A profile fetched before the stored one (e.g. served from a cache) is older data
+            .where(or_(fetched_date.is_(None), Entity.profileFetchedDate.is_(None),
+                       fetched_date >= Entity.profileFetchedDate))
+            .values(fullname=func.coalesce(cast(owner.c.fullname, String), Entity.fullname),
+                    followers=func.coalesce(cast(owner.c.followers, Integer), Entity.followers),
+                    profileFetchedDate=func.coalesce(fetched_date, Entity.profileFetchedDate))
+        )
+
+    links = sorted(
+        (url_id, entity_ids[key]) for url_id, key in url_owners.items() if urls[url_id].entityId != entity_ids[key]
+    )
+    for batch in chunked(links, BULK_INSERT_BATCH_SIZE):
+        link = values(sa_column("url_id", Integer), sa_column("entity_id", Integer), name="link").data(batch)
+        await db.exec(update(URL).where(URL.id == link.c.url_id).values(entityId=link.c.entity_id))
+        await move_latest_metrics(db, [(url_id, entity_id, url_owners[url_id][0]) for url_id, entity_id in batch])
+
+    return {url_id: (entity_ids[key], key[0]) for url_id, key in url_owners.items()}, len(created_keys)
+
+
+async def move_latest_metrics(db: AsyncSession, links: List[Tuple[int, int, PlatformEnum]]) -> None:
+    """
+    Move the latest metrics of relinked URLs to their new entity.
+
+    Needed when the ingested snapshot is older than the latest one, which then
+    stays in place; entity_metrics moves by the delta.
+    """
+    url_ids = [url_id for url_id, _, _ in links]
+    previous = (await db.exec(
+        select(*CONTRIBUTION_COLUMNS)
+        .where(URLLatestMetrics.urlId == url_ids_param(url_ids))
+        .order_by(URLLatestMetrics.urlId)
+        .with_for_update()
+    )).all()
+    if not previous:
+        return
+
+    link = values(
+        sa_column("url_id", Integer), sa_column("entity_id", Integer),
+        sa_column("platform", URLLatestMetrics.__table__.c.platform.type), name="link"
+    ).data(links)
+    replaced = (await db.exec(
+        update(URLLatestMetrics).where(URLLatestMetrics.urlId == link.c.url_id)
+        .values(entityId=link.c.entity_id, platform=link.c.platform)
+        .returning(*CONTRIBUTION_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )).all()
+    await apply_entity_metrics_deltas(db, previous, replaced)
+
+
+def resolve_snapshot_targets(items: List[SnapshotIngestItem]) -> List[SnapshotIngestItem]:
+    """
+    Let at most one item of the batch fill each (url_id, snapshot_id).
+
+    SQS delivers at least once, so a batch can hold the same result twice:
+    exact repeats are dropped. Of differing results naming one snapshot the
+    newest (by date_analyzed, the last on ties, as for the latest metrics)
+    fills it and the others are added as new snapshots, so every result the
+    latest metrics may be taken from has a snapshot row holding it.
+    """
+    targets: Dict[Tuple[int, int], SnapshotIngestItem] = {}
+    for item in items:
+        key = (item.url_id, item.snapshot_id)
+        if item.snapshot_id is not None and (key not in targets
+                                             or item.date_analyzed >= targets[key].date_analyzed):
+            targets[key] = item
+
+    resolved = []
+    seen = set()
+    for item in items:
+        dump = item.model_dump_json()
+        if dump in seen:
+            continue
+        seen.add(dump)
+        if item.snapshot_id is not None and targets[(item.url_id, item.snapshot_id)] != item:
+            item = item.model_copy(update={"snapshot_id": None})
+        resolved.append(item)
+    return resolved
+
+
+async def copy_snapshots_to_staging(db: AsyncSession, items: List[SnapshotIngestItem], urls: Dict[int, Any]) -> None:
+    """COPY the batch into SNAPSHOT_STAGING over the session's connection, inside its transaction."""
+    await db.exec(CreateTable(SNAPSHOT_STAGING))
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        SNAPSHOT_STAGING.name,
+        columns=[column.name for column in SNAPSHOT_STAGING.columns],
+        records=[
+            (item.url_id, urls[item.url_id].type.value, item.snapshot_id, item.likes, item.comments, item.views,
+             item.traffic_count, item.engagement_rate, item.date_analyzed, item.is_broken_or_deleted,
+             item.is_fetched)
+            for item in items
+        ],
+    )
+
+
+async def apply_staged_snapshots(db: AsyncSession) -> Tuple[int, int]:
+    """
+    Move the staged snapshots into post/blog_web_post with one UPDATE and one INSERT ... SELECT per table.
+
+    Snapshots naming a snapshot_id of their URL fill that row in place (the
+    placeholder created on upload or flagged for re-analysis); the rest are added.
+
+    :return: Number of snapshots updated and inserted.
+    """
+    staged = SNAPSHOT_STAGING.c
+    state = {
+        "engagementRate": staged.engagement_rate,
+        "dateAnalysed": staged.date_analyzed,
+        "isBrokenOrDeleted": staged.is_broken_or_deleted,
+        "isFetched": staged.is_fetched,
+    }
+    snapshot_tables = [
+        (Post, URLTypeEnum.POST,
+         {"likes": staged.likes, "comments": staged.comments, "views": staged.views}),
+        (BlogWebPost, URLTypeEnum.WEB_POST, {"trafficCount": staged.traffic_count}),
+    ]
+
+    updated = inserted = 0
+    for model, url_type, counters in snapshot_tables:
+        of_type = staged.url_type == url_type.value
+        updated += (await db.exec(
+            update(model)
+            .where(of_type, model.id == staged.snapshot_id, model.urlId == staged.url_id)
+            .values(**counters, **state)
+            .execution_options(synchronize_session=False)
+        )).rowcount
+
+        columns = {"urlId": staged.url_id, **counters, **state}
+        inserted += (await db.exec(
+            insert(model).from_select(
+                [getattr(model, name) for name in columns],
+                select(*columns.values()).where(
+                    of_type, ~exists().where(model.id == staged.snapshot_id, model.urlId == staged.url_id)
+                )
+            )
+        )).rowcount
+
+    return updated, inserted
+
+
+def snapshot_from_item(item: SnapshotIngestItem, url_type: URLTypeEnum) -> Union[Post, BlogWebPost]:
+    state = {
+        "engagementRate": item.engagement_rate,
+        "dateAnalysed": item.date_analyzed,
+        "isBrokenOrDeleted": item.is_broken_or_deleted,
+        "isFetched": item.is_fetched,
+        "urlId": item.url_id,
+    }
+    if url_type == URLTypeEnum.POST:
+        return Post(likes=item.likes, comments=item.comments, views=item.views, **state)
+    return BlogWebPost(trafficCount=item.traffic_count, **state)
+
+
+async def ingest_snapshots(db: AsyncSession, items: List[SnapshotIngestItem]) -> SnapshotIngestResponse:
+    """
+    Store a batch of scrape results in one transaction.
+
+    Repeated results are resolved first (see resolve_snapshot_targets), owners
+    are upserted and linked, the snapshots are COPYed into a staging table and
+    applied set-based, and the newest snapshot per URL becomes its latest
+    metrics (moving entity_metrics by the delta). Snapshots of unknown URLs are
+    skipped and reported.
+    """
+    url_ids = list(dict.fromkeys(item.url_id for item in items))
+    urls = {row.id: row for row in (await db.exec(
+        select(URL.id, URL.url, URL.type, URL.entityId, URL.created_date, Entity.platform.label("entity_platform"))
+        .outerjoin(Entity, URL.entityId == Entity.id)
+        .where(URL.id == url_ids_param(url_ids))
+    )).all()}
+    missing_url_ids = [url_id for url_id in url_ids if url_id not in urls]
+    items = resolve_snapshot_targets([item for item in items if item.url_id in urls])
+    if not items:
+        return SnapshotIngestResponse(
+            inserted_count=0, updated_count=0, created_entity_count=0, missing_url_ids=missing_url_ids
+        )
+
+    try:
+        owners, created = await upsert_snapshot_owners(db, items, urls)
+        await copy_snapshots_to_staging(db, items, urls)
+        updated, inserted = await apply_staged_snapshots(db)
+
+        newest: Dict[int, SnapshotIngestItem] = {}
+        for item in items:
+            if item.url_id not in newest or item.date_analyzed >= newest[item.url_id].date_analyzed:
+                newest[item.url_id] = item
+
+        latest_rows = []
+        for url_id, item in newest.items():
+            url = urls[url_id]
+            entity_id, platform = owners.get(url_id, (url.entityId, url.entity_platform or detect_platform(url.url)))
+            row = latest_metrics_values(url, snapshot_from_item(item, url.type), platform)
+            row["entity_id"] = entity_id
+            latest_rows.append(row)
+        for batch in chunked(latest_rows, BULK_INSERT_BATCH_SIZE):
+            await upsert_url_latest_metrics(db, batch)
+
+        await db.commit()
+
+    except Exception:
+        await db.rollback()
+        raise
+
+    return SnapshotIngestResponse(
+        inserted_count=inserted, updated_count=updated, created_entity_count=created, missing_url_ids=missing_url_ids
+    )
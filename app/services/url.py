@@ -1,21 +1,88 @@
-from datetime import date
-from typing import Optional, Dict, Any
+from datetime import date, timedelta
+from typing import Optional, Dict, Any, AsyncIterator, Iterator, List, Tuple, Union
 from collections import defaultdict
 from urllib.parse import urlparse
+from sqlalchemy import Integer, String, any_, bindparam, update
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, array_agg, insert
 from sqlmodel import Session, select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.models.blog_web_post import BlogWebPost
 from app.models.entity import Entity
 from app.models.enums.platform import PlatformEnum
-from app.models.enums.url import URLTypeEnum
+from app.models.enums.url import HistoryBucketEnum, URLTypeEnum
 from app.models.post import Post
 from app.models.url import URL
+from app.models.url_latest_metrics import URLLatestMetrics
+from app.models.url_reanalysis_job import URLReanalysisJob
+from app.schemas.requests.url import BulkReanalyzeRequest
+from app.schemas.responses.url import URLReanalysisJobResponse, URLSuccessItem
+from app.services.entity_metrics import CONTRIBUTION_COLUMNS, apply_entity_metrics_deltas
+from app.services.platform_classifier import platform_classifier
+from app.services.scrape_outbox import enqueue_scrape_jobs
+from app.utils.cache import invalidate_dates_on_commit
+from app.utils.canonical_url import canonical_key
+from app.utils.date import get_ist_date, get_utc_now
+from app.utils.pagination import decode_cursor
 from datetime import datetime
 
+# Keeps multi-row INSERTs well under the 32767 bind parameter limit of PostgreSQL
+BULK_INSERT_BATCH_SIZE = 1000
 
-def get_platform_summary(
-        db: Session, start_utc: Optional[datetime], end_utc: Optional[datetime] = None
-) -> Dict[str, Any]:
+LATEST_METRICS_UPDATE_COLUMNS = (
+    "entity_id", "platform", "engagement_rate", "likes", "comments", "views", "is_broken_or_deleted", "is_fetched",
+    "date_analyzed"
+)
+
+
+async def get_platform_summary(db: AsyncSession, upload_date: Optional[date] = None) -> Dict[str, Any]:
+    query = select(*platform_summary_columns()).where(URLLatestMetrics.entityId.is_not(None))
+    if upload_date:
+        query = query.where(URLLatestMetrics.uploadDate == upload_date)
+    query = query.group_by(URLLatestMetrics.platform)
+
+    return build_platform_summary((await db.exec(query)).all())
+
+
+async def get_platform_summary_by_day(db: AsyncSession, date_from: date, date_to: date) -> List[Dict[str, Any]]:
+    """
+    Platform summary for every IST upload day in [date_from, date_to].
+
+    A single GROUP BY (upload_date, platform) pass feeds every day; days without
+    URLs are reported with zero counts so the series has no gaps.
+    """
+    query = (
+        select(URLLatestMetrics.uploadDate.label("upload_date"), *platform_summary_columns())
+        .where(URLLatestMetrics.entityId.is_not(None))
+        .where(URLLatestMetrics.uploadDate.between(date_from, date_to))
+        .group_by(URLLatestMetrics.uploadDate, URLLatestMetrics.platform)
+    )
+
+    rows_by_day = defaultdict(list)
+    for row in (await db.exec(query)).all():
+        rows_by_day[row.upload_date].append(row)
+
+    summaries = []
+    for offset in range((date_to - date_from).days + 1):
+        day = date_from + timedelta(days=offset)
+        summaries.append({"date_uploaded": day, **build_platform_summary(rows_by_day[day])})
+    return summaries
+
+
+def platform_summary_columns() -> tuple:
+    """Per-platform URL count and top performer, picked within the same GROUP BY pass."""
+    top_first = (URLLatestMetrics.engagementRate.desc(), URLLatestMetrics.urlId)
+    return (
+        URLLatestMetrics.platform,
+        func.count().label("url_count"),
+        array_agg(aggregate_order_by(URLLatestMetrics.urlId, *top_first))[1].label("top_url_id"),
+        array_agg(aggregate_order_by(URLLatestMetrics.url, *top_first))[1].label("top_url"),
+        func.max(URLLatestMetrics.engagementRate).label("top_engagement_rate"),
+    )
+
+
+def build_platform_summary(rows) -> Dict[str, Any]:
+    """Turn the per-platform rows of platform_summary_columns() into the summary payload."""
     platform_counts = {
         PlatformEnum.FACEBOOK: 0,
         PlatformEnum.INSTAGRAM: 0,
@@ -23,47 +90,18 @@ def get_platform_summary(
         PlatformEnum.YOUTUBE: 0
     }
 
-    url_data_map = {}
-
-    url_type_filters = [
-        (Post, URLTypeEnum.POST),
-        (BlogWebPost, URLTypeEnum.WEB_POST)
-    ]
+    top_performer = None
+    for row in rows:
+        platform_counts[row.platform] += row.url_count
+        if top_performer is None or row.top_engagement_rate > top_performer["engagement_rate"]:
+            top_performer = {
+                "url_id": row.top_url_id,
+                "url": row.top_url,
+                "platform": row.platform,
+                "engagement_rate": row.top_engagement_rate
+            }
 
-    for model, url_type in url_type_filters:
-        query = select(model).join(URL).join(Entity)
-        if start_utc and end_utc:
-            query = query.where(URL.created_date.between(start_utc, end_utc))
-        results = db.exec(query).all()
-
-        for item in results:
-            url_obj = item.url
-            if not url_obj or not url_obj.entity or url_obj.type != url_type:
-                continue
-
-            url_id = url_obj.id
-            engagement = getattr(item, "engagementRate", 0)
-
-            # If URL not seen before or this post/blog has higher engagement, update
-            if (
-                url_id not in url_data_map or
-                engagement > url_data_map[url_id]["engagement_rate"]
-            ):
-                url_data_map[url_id] = {
-                    "url_id": url_obj.id,
-                    "url": url_obj.url,
-                    "platform": url_obj.entity.platform,
-                    "engagement_rate": engagement
-                }
-
-    total_urls = len(url_data_map)
-
-    # Re-calculate platform counts from distinct URLs only
-    for url_info in url_data_map.values():
-        platform_counts[url_info["platform"]] += 1
-
-    # Get top performer
-    top_performer = max(url_data_map.values(), key=lambda x: x["engagement_rate"], default=None)
+    total_urls = sum(platform_counts.values())
 
     return {
         "total": total_urls,
@@ -73,7 +111,430 @@ def get_platform_summary(
         "youtube_percent": round((platform_counts[PlatformEnum.YOUTUBE] / total_urls) * 100, 2) if total_urls else 0,
         "top_performer": top_performer
     }
-    
+
+
+def engagement_history_query(url_type: URLTypeEnum, url_id: int, bucket: Optional[HistoryBucketEnum] = None):
+    """
+    Snapshots of a URL in date order, or only the last snapshot of every hour/day/week.
+
+    Bucketing runs in SQL: DISTINCT ON date_trunc(bucket, date_analyzed) keeps the latest
+    snapshot of each bucket, which also holds its max since the counters are cumulative.
+    """
+    if url_type == URLTypeEnum.POST:
+        model = Post
+        metrics = [Post.likes.label("likes"), Post.views.label("views"), Post.comments.label("comments")]
+    else:
+        model = BlogWebPost
+        metrics = [BlogWebPost.trafficCount.label("traffic_count")]
+    columns = [model.dateAnalysed.label("date_analyzed"), model.engagementRate.label("engagement_rate"), *metrics]
+
+    if bucket is None:
+        return select(*columns).where(model.urlId == url_id).order_by(model.dateAnalysed)
+
+    bucket_start = func.date_trunc(bucket.value, model.dateAnalysed)
+    latest = (
+        select(bucket_start.label("bucket_start"), *columns)
+        .where(model.urlId == url_id)
+        .distinct(bucket_start)
+        .order_by(bucket_start, model.dateAnalysed.desc())
+        .subquery()
+    )
+    return select(*latest.c).order_by(latest.c.bucket_start)
+
+
+def url_ids_param(url_ids: List[int]):
+    """Bind a list of url ids as one array parameter, for ``column == any_(...)``."""
+    return any_(bindparam("url_ids", url_ids, type_=ARRAY(Integer)))
+
+
+def latest_snapshots_query(model: Union[type[Post], type[BlogWebPost]], url_ids: List[int]):
+    """Latest Post/BlogWebPost of every URL in url_ids, with DISTINCT ON (url_id)."""
+    return (
+        select(model)
+        .where(model.urlId == url_ids_param(url_ids))
+        .distinct(model.urlId)
+        .order_by(model.urlId, model.dateAnalysed.desc())
+    )
+
+
+def url_analysis_summary(url: URL, entity: Optional[Entity], post: Optional[Post],
+                         blog: Optional[BlogWebPost]) -> Dict[str, Any]:
+    """Fields of URLAnalysisSummaryResponse for a URL and its latest snapshot of its type."""
+    data = {
+        "url_id": url.id,
+        "post_url": url.url,
+        "user_profile_name": entity.fullname if entity else None,
+        "url_type": url.type,
+        "platform": entity.platform if entity else detect_platform(url.url),
+        "latest_likes": None,
+        "latest_views": None,
+        "latest_comments": None,
+        "latest_engagement_rate": 0.0,
+        "traffic_count": None,
+        "is_broken_or_deleted": False,
+        "is_fetched": False
+    }
+
+    if url.type == URLTypeEnum.POST and post:
+        data.update({
+            "latest_likes": post.likes,
+            "latest_views": post.views,
+            "latest_comments": post.comments,
+            "latest_engagement_rate": post.engagementRate,
+            "is_broken_or_deleted": post.isBrokenOrDeleted,
+            "is_fetched": post.isFetched
+        })
+
+    elif url.type == URLTypeEnum.WEB_POST and blog:
+        data.update({
+            "latest_engagement_rate": blog.engagementRate,
+            "traffic_count": blog.trafficCount,
+            "is_broken_or_deleted": blog.isBrokenOrDeleted,
+            "is_fetched": blog.isFetched
+        })
+
+    return data
+
+
+def url_detail_row(item: URLLatestMetrics) -> Dict[str, Any]:
+    """Serialize a url_latest_metrics row the way /url/all reports it."""
+    return {
+        "id": item.urlId,
+        "url": item.url,
+        "engagement_rate": item.engagementRate,
+        "platform": item.platform,
+        "date_uploaded": item.dateUploaded.isoformat(),
+        "date_analyzed": item.dateAnalysed.isoformat() if item.dateAnalysed else None,
+        "is_fetched": item.isFetched,
+        "is_broken_or_deleted": item.isBrokenOrDeleted
+    }
+
+
+def decode_url_listing_cursor(cursor: str) -> tuple:
+    """
+    Keyset values (engagement rate, upload time, url id) of a /url/all cursor.
+
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        rate, uploaded, url_id = decode_cursor(cursor, 3)
+        return int(rate), datetime.fromisoformat(uploaded), int(url_id)
+    except TypeError as e:
+        raise ValueError("Invalid cursor") from e
+
+
+async def iter_url_details(
+        db: AsyncSession, date_from: date, date_to: date, batch_size: int = 1000
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream /url/all rows for every IST upload day in [date_from, date_to].
+
+    Rows are fetched through a server-side cursor in batches of batch_size, so
+    memory stays flat regardless of the size of the range.
+    """
+    query = (
+        select(URLLatestMetrics)
+        .where(URLLatestMetrics.uploadDate.between(date_from, date_to))
+        .where(URLLatestMetrics.entityId.is_not(None))
+        .order_by(URLLatestMetrics.uploadDate, URLLatestMetrics.urlId)
+        .execution_options(yield_per=batch_size)
+    )
+    async for item in await db.stream_scalars(query):
+        yield url_detail_row(item)
+
+
+def latest_metrics_values(url: URL, snapshot: Union[Post, BlogWebPost], platform: str) -> Dict[str, Any]:
+    """Build a url_latest_metrics row for the snapshot of the URL."""
+    if url.type == URLTypeEnum.POST:
+        likes, comments, views = snapshot.likes, snapshot.comments, snapshot.views or 0
+    else:
+        likes, comments, views = 0, 0, snapshot.trafficCount or 0
+    return {
+        "url_id": url.id,
+        "entity_id": url.entityId,
+        "url": url.url,
+        "type": url.type,
+        "platform": platform,
+        "engagement_rate": snapshot.engagementRate,
+        "likes": likes,
+        "comments": comments,
+        "views": views,
+        "is_broken_or_deleted": snapshot.isBrokenOrDeleted,
+        "is_fetched": snapshot.isFetched,
+        "date_analyzed": snapshot.dateAnalysed,
+        "date_uploaded": url.created_date,
+        "upload_date": get_ist_date(url.created_date),
+    }
+
+
+def url_latest_metrics_upsert(rows: List[Dict[str, Any]]):
+    """
+    Build the upsert recording snapshots as the latest metrics of their URLs.
+
+    A row is only replaced by a snapshot analysed at the same time or later, so
+    out-of-order writes never regress it.
+    """
+    stmt = insert(URLLatestMetrics).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[URLLatestMetrics.urlId],
+        set_={column: stmt.excluded[column] for column in LATEST_METRICS_UPDATE_COLUMNS},
+        where=URLLatestMetrics.dateAnalysed <= stmt.excluded.date_analyzed,
+    )
+
+
+async def upsert_url_latest_metrics(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    """
+    Record snapshots as the latest metrics of their URLs.
+
+    The rows being replaced are locked and read first, so the entity_metrics
+    totals move by the difference between the old and the new snapshot. The
+    caller owns the commit, which also invalidates the cached responses of the
+    affected upload dates.
+    """
+    if not rows:
+        return
+
+    previous = (await db.exec(
+        select(*CONTRIBUTION_COLUMNS)
+        .where(URLLatestMetrics.urlId == url_ids_param([row["url_id"] for row in rows]))
+        .order_by(URLLatestMetrics.urlId)
+        .with_for_update()
+    )).all()
+    replaced = (await db.exec(url_latest_metrics_upsert(rows).returning(*CONTRIBUTION_COLUMNS))).all()
+    await apply_entity_metrics_deltas(db, previous, replaced)
+    invalidate_dates_on_commit(db, {row["upload_date"] for row in rows})
+
+
+def rebuild_url_latest_metrics(db: Session, batch_size: int = 1000) -> None:
+    """Recompute url_latest_metrics from the full Post/BlogWebPost history."""
+    url_type_filters = [
+        (Post, URLTypeEnum.POST),
+        (BlogWebPost, URLTypeEnum.WEB_POST)
+    ]
+
+    for model, url_type in url_type_filters:
+        latest = (
+            select(model, URL, Entity)
+            .join(URL, model.urlId == URL.id)
+            .outerjoin(Entity, URL.entityId == Entity.id)
+            .where(URL.type == url_type)
+            .distinct(model.urlId)
+            .order_by(model.urlId, model.dateAnalysed.desc())
+        )
+        rows = [
+            latest_metrics_values(url_obj, snapshot, entity.platform if entity else detect_platform(url_obj.url))
+            for snapshot, url_obj, entity in db.exec(latest)
+        ]
+        for i in range(0, len(rows), batch_size):
+            db.exec(url_latest_metrics_upsert(rows[i:i + batch_size]))
+        invalidate_dates_on_commit(db, {row["upload_date"] for row in rows})
+
+    db.commit()
+
+
+def get_url_type(platform: str) -> URLTypeEnum:
+    return (
+        URLTypeEnum.POST
+        if platform in [PlatformEnum.FACEBOOK, PlatformEnum.INSTAGRAM, PlatformEnum.YOUTUBE]
+        else URLTypeEnum.WEB_POST
+    )
+
+
+def chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+async def bulk_create_urls(db: AsyncSession, raw_urls: List[str]) -> Tuple[List[URLSuccessItem], List[str]]:
+    """
+    Create URLs and their placeholder snapshots in a single transaction.
+
+    Duplicates are matched on canonical_key(), so tracking parameters, www.
+    hosts, platform m. hosts and short links do not create new URLs, with one indexed
+    ``canonical_key = ANY(:keys)`` lookup. URLs, snapshots and their scrape outbox
+    rows are bulk inserted in batches of BULK_INSERT_BATCH_SIZE and everything is
+    committed once. Returns the created URLs and the rejected inputs, annotated the
+    way /url/upload-urls reports them.
+    """
+    success_urls: List[URLSuccessItem] = []
+    failed_urls: List[str] = []
+
+    keys: Dict[str, str] = {}
+    seen_keys = set()
+    for raw_url in dict.fromkeys(url.strip() for url in raw_urls if url.strip()):
+        if not is_valid_url(raw_url):
+            failed_urls.append(raw_url)
+        elif (key := canonical_key(raw_url)) in seen_keys:
+            failed_urls.append(f"{raw_url} (duplicate)")
+        else:
+            keys[raw_url] = key
+            seen_keys.add(key)
+
+    if not keys:
+        return success_urls, failed_urls
+
+    existing = set((await db.exec(
+        select(URL.canonicalKey).where(
+            URL.canonicalKey == any_(bindparam("keys", list(keys.values()), type_=ARRAY(String)))
+        )
+    )).all())
+    failed_urls.extend(f"{raw_url} (already exists)" for raw_url, key in keys.items() if key in existing)
+
+    new_urls = [raw_url for raw_url, key in keys.items() if key not in existing]
+    platforms = dict(zip(new_urls, platform_classifier.classify_many(new_urls)))
+    if not platforms:
+        return success_urls, failed_urls
+
+    now = get_utc_now()
+    # Already reported as existing when the batch fails later on
+    conflicted: Dict[str, None] = {}
+    try:
+        created = []
+        for batch in chunked(list(platforms), BULK_INSERT_BATCH_SIZE):
+            created.extend((await db.exec(
+                insert(URL)
+                .values([
+                    {"url": raw_url, "canonical_key": keys[raw_url], "type": get_url_type(platforms[raw_url]),
+                     "created_date": now}
+                    for raw_url in batch
+                ])
+                .on_conflict_do_nothing()
+                .returning(URL.id, URL.url, URL.type, URL.entityId, URL.created_date)
+            )).all())
+
+        # Rows skipped by ON CONFLICT were inserted concurrently since the lookup
+        created_urls = {row.url for row in created}
+        conflicted = dict.fromkeys(raw_url for raw_url in platforms if raw_url not in created_urls)
+        failed_urls.extend(f"{raw_url} (already exists)" for raw_url in conflicted)
+
+        placeholder = {
+            "engagement_rate": 0,
+            "date_analyzed": now,
+            "is_broken_or_deleted": False,
+            "is_fetched": False,
+        }
+        snapshot_inserts = [
+            (Post, URLTypeEnum.POST, {"comments": 0, "likes": 0, "views": 0}, (Post.likes, Post.comments, Post.views)),
+            (BlogWebPost, URLTypeEnum.WEB_POST, {"traffic_count": 0}, (BlogWebPost.trafficCount,)),
+        ]
+
+        snapshots = {}
+        for model, url_type, counters, counter_columns in snapshot_inserts:
+            url_ids = [row.id for row in created if row.type == url_type]
+            for batch in chunked(url_ids, BULK_INSERT_BATCH_SIZE):
+                snapshots.update(
+                    (snapshot.urlId, snapshot) for snapshot in (await db.exec(
+                        insert(model)
+                        .values([{"url_id": url_id, **placeholder, **counters} for url_id in batch])
+                        .returning(model.id, model.urlId, model.engagementRate, model.isBrokenOrDeleted,
+                                   model.isFetched, model.dateAnalysed, *counter_columns)
+                    )).all()
+                )
+
+        latest_rows = [latest_metrics_values(row, snapshots[row.id], platforms[row.url]) for row in created]
+        for batch in chunked(latest_rows, BULK_INSERT_BATCH_SIZE):
+            await upsert_url_latest_metrics(db, batch)
+
+        for row in created:
+            snapshot_id = snapshots[row.id].id
+            success_urls.append(URLSuccessItem(
+                url_id=row.id,
+                url=row.url,
+                platform=platforms[row.url],
+                post_id=snapshot_id if row.type == URLTypeEnum.POST else None,
+                web_id=snapshot_id if row.type == URLTypeEnum.WEB_POST else None
+            ))
+        await enqueue_scrape_jobs(db, success_urls)
+
+        await db.commit()
+
+    except Exception as e:
+        await db.rollback()
+        failed_urls.extend(f"{raw_url} (error: {str(e)})" for raw_url in platforms if raw_url not in conflicted)
+        return [], failed_urls
+
+    return success_urls, failed_urls
+
+
+async def bulk_reanalyze_urls(db: AsyncSession, filters: BulkReanalyzeRequest) -> URLReanalysisJob:
+    """
+    Mark the latest snapshot of every URL matching the filters as unfetched and queue it for scraping.
+
+    URLs are selected on url_latest_metrics and flipped with one UPDATE ... RETURNING,
+    the matching Post/BlogWebPost rows with one UPDATE ... FROM per table. The scrape
+    messages go to the outbox under the job id, all in one transaction.
+    """
+    latest = URLLatestMetrics
+    conditions = []
+    if filters.platform:
+        conditions.append(latest.platform == filters.platform)
+    if filters.date_from:
+        conditions.append(latest.uploadDate >= filters.date_from)
+    if filters.date_to:
+        conditions.append(latest.uploadDate <= filters.date_to)
+    if filters.is_broken_or_deleted is not None:
+        conditions.append(latest.isBrokenOrDeleted == filters.is_broken_or_deleted)
+    if filters.is_fetched is not None:
+        conditions.append(latest.isFetched == filters.is_fetched)
+    if filters.url_ids:
+        conditions.append(latest.urlId == url_ids_param(filters.url_ids))
+
+    job = URLReanalysisJob(filters=filters.model_dump(mode="json", exclude_none=True))
+    try:
+        matched = (await db.exec(
+            update(latest).where(*conditions).values(isFetched=False)
+            .returning(latest.urlId, latest.url, latest.type, latest.uploadDate)
+        )).all()
+        url_ids = [row.urlId for row in matched]
+
+        snapshot_ids = {}
+        for model in (Post, BlogWebPost):
+            flipped = (await db.exec(
+                update(model)
+                .where(model.urlId == latest.urlId, model.dateAnalysed == latest.dateAnalysed,
+                       latest.urlId == url_ids_param(url_ids))
+                .values(isFetched=False)
+                .returning(model.id, model.urlId)
+            )).all()
+            snapshot_ids.update((row.urlId, row.id) for row in flipped)
+
+        platforms = platform_classifier.classify_many([row.url for row in matched])
+        job.matchedCount = len(matched)
+        db.add(job)
+        await db.flush()
+        await enqueue_scrape_jobs(db, [
+            URLSuccessItem(
+                url_id=row.urlId,
+                url=row.url,
+                platform=platform,
+                post_id=snapshot_ids.get(row.urlId) if row.type == URLTypeEnum.POST else None,
+                web_id=snapshot_ids.get(row.urlId) if row.type == URLTypeEnum.WEB_POST else None,
+                is_reanalysis=True
+            )
+            for row, platform in zip(matched, platforms)
+        ], job_id=job.id)
+
+        invalidate_dates_on_commit(db, {row.uploadDate for row in matched})
+        await db.commit()
+
+    except Exception:
+        await db.rollback()
+        raise
+
+    return job
+
+
+def url_reanalysis_job_response(job: URLReanalysisJob, pending_count: int,
+                                failed_count: int) -> URLReanalysisJobResponse:
+    return URLReanalysisJobResponse(
+        job_id=job.id,
+        matched_count=job.matchedCount,
+        pending_count=pending_count,
+        failed_count=failed_count,
+        filters=job.filters,
+        created_date=job.created_date,
+    )
+
 
 def is_valid_url(url: str) -> bool:
     try:
@@ -84,19 +545,5 @@ def is_valid_url(url: str) -> bool:
 
 
 def detect_platform(url: str) -> str:
-    try:
-        parsed = urlparse(url.lower())
-        domain = parsed.netloc.replace("www.", "")
-
-        if domain in {"facebook.com", "m.facebook.com"}:
-            return PlatformEnum.FACEBOOK.value
-        elif domain in {"instagram.com"}:
-            return PlatformEnum.INSTAGRAM.value
-        elif domain in {"youtube.com", "youtu.be"}:
-            return PlatformEnum.YOUTUBE.value
-        else:
-            return PlatformEnum.WEBSITE.value
-
-    except Exception:
-        return PlatformEnum.WEBSITE.value
+    return platform_classifier.classify(url)
 
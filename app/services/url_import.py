@@ -0,0 +1,125 @@
+import csv
+import os
+import tempfile
+from typing import Iterator, List, Tuple
+
+from fastapi import UploadFile
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.session import async_engine
+from app.models.enums.url import URLImportStatusEnum
+from app.models.url_import_job import URLImportJob
+from app.schemas.responses.url import URLImportJobResponse
+from app.services.scrape_outbox import outbox_relay
+from app.services.url import bulk_create_urls
+from app.utils.date import get_utc_now
+
+# Bytes read from the upload per await, and URLs handed to bulk_create_urls per transaction
+UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
+IMPORT_CHUNK_SIZE = 1000
+MAX_IMPORT_FAILED_URLS = 1000
+
+
+async def save_upload_to_temp_file(file: UploadFile) -> Tuple[str, int]:
+    """
+    Copy an uploaded file to a temporary file in fixed-size chunks.
+
+    :return: Path of the temporary file and the number of lines it holds.
+    """
+    line_count = 0
+    last_byte = b"\n"
+    with tempfile.NamedTemporaryFile(prefix="url-import-", suffix=".csv", delete=False) as tmp:
+        while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+            tmp.write(chunk)
+            line_count += chunk.count(b"\n")
+            last_byte = chunk[-1:]
+    if last_byte != b"\n":
+        line_count += 1
+    return tmp.name, line_count
+
+
+def iter_import_rows(path: str) -> Iterator[str]:
+    """Yield the first column of every row of a newline-separated or CSV file, blanks included."""
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as f:
+        for index, row in enumerate(csv.reader(f)):
+            value = row[0].strip() if row else ""
+            # Optional header row
+            if index == 0 and value.lower() == "url":
+                value = ""
+            yield value
+
+
+def url_import_job_response(job: URLImportJob) -> URLImportJobResponse:
+    return URLImportJobResponse(
+        job_id=job.id,
+        filename=job.filename,
+        status=job.status,
+        total_count=job.totalCount,
+        processed_count=job.processedCount,
+        added_count=job.addedCount,
+        failed_count=job.failedCount,
+        failed_urls=job.failedUrls,
+        error=job.error,
+        created_date=job.created_date,
+        completed_date=job.completedDate,
+    )
+
+
+async def process_import_chunk(db: AsyncSession, job: URLImportJob, rows: List[str]) -> None:
+    success_urls, failed_urls = await bulk_create_urls(db, rows)
+    # bulk_create_urls commits or rolls back, either way the job has to be reloaded
+    await db.refresh(job)
+    if success_urls:
+        outbox_relay.wake()
+
+    job.processedCount += len(rows)
+    job.addedCount += len(success_urls)
+    job.failedCount += len(failed_urls)
+    if len(job.failedUrls) < MAX_IMPORT_FAILED_URLS:
+        job.failedUrls = job.failedUrls + failed_urls[:MAX_IMPORT_FAILED_URLS - len(job.failedUrls)]
+    db.add(job)
+    await db.commit()
+
+
+async def run_url_import(job_id: int, path: str) -> None:
+    """
+    Background task importing the URLs of a saved upload in chunks of IMPORT_CHUNK_SIZE.
+
+    Every chunk, with its scrape outbox rows, is created and committed by
+    bulk_create_urls before the job counters are updated, so progress reflects
+    what is already persisted.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        job = await db.get(URLImportJob, job_id)
+        if job is None:
+            os.remove(path)
+            return
+
+        try:
+            job.status = URLImportStatusEnum.RUNNING
+            db.add(job)
+            await db.commit()
+
+            rows = []
+            for value in iter_import_rows(path):
+                rows.append(value)
+                if len(rows) >= IMPORT_CHUNK_SIZE:
+                    await process_import_chunk(db, job, rows)
+                    rows = []
+            if rows:
+                await process_import_chunk(db, job, rows)
+
+            job.status = URLImportStatusEnum.COMPLETED
+
+        except Exception as e:
+            print(e)
+            await db.rollback()
+            job.status = URLImportStatusEnum.FAILED
+            job.error = str(e)
+
+        finally:
+            os.remove(path)
+
+        job.completedDate = get_utc_now()
+        db.add(job)
+        await db.commit()
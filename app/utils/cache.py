@@ -0,0 +1,145 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.configs import settings
+from app.utils.decorators.singleton import singleton
+
+ALL_DATES_TAG = "all"
+CHANGED_DATES_KEY = "response_cache_changed_dates"
+
+
+class CacheBackend(ABC):
+    """Storage used by ResponseCache. Implement this to move the cache to a shared store."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """Process-local backend with per-entry TTL and LRU eviction once max_entries is reached."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]] = OrderedDict()
+        self._tag_index: Dict[str, Set[str]] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: float, tags: Iterable[str]) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            tags = tuple(tags)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tag_index.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_tags(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                for key in self._tag_index.pop(tag, set()):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tag_index.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+
+@singleton
+class ResponseCache:
+    """
+    Caches read-endpoint responses keyed by endpoint and parameters.
+
+    Entries are tagged with the IST upload date they depend on (or ALL_DATES_TAG
+    when they span every date) and dropped when a write touches that date.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend or InMemoryCacheBackend(max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES)
+        self.ttl = settings.RESPONSE_CACHE_TTL_SECONDS
+
+    def configure(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    @staticmethod
+    def build_key(endpoint: str, **params: Any) -> str:
+        return endpoint + "?" + "&".join(f"{name}={params[name]}" for name in sorted(params))
+
+    @staticmethod
+    def date_tag(day: Optional[date]) -> str:
+        return f"date:{day.isoformat()}" if day else ALL_DATES_TAG
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.backend.get(key)
+
+    def set(self, key: str, value: Any, day: Optional[date] = None) -> None:
+        self.backend.set(key, value, self.ttl, [self.date_tag(day)])
+
+    def invalidate_dates(self, days: Iterable[date]) -> None:
+        # Undated entries (all-time summary, URL count) change whenever any date does
+        self.backend.invalidate_tags([self.date_tag(day) for day in days] + [ALL_DATES_TAG])
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_dates_on_commit(db: Session, days: Iterable[date]) -> None:
+    """Invalidate cached responses for these upload dates once the session commits."""
+    db.info.setdefault(CHANGED_DATES_KEY, set()).update(days)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_dates(session: Session) -> None:
+    days = session.info.pop(CHANGED_DATES_KEY, None)
+    if days:
+        response_cache.invalidate_dates(days)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_dates(session: Session) -> None:
+    session.info.pop(CHANGED_DATES_KEY, None)
@@ -13,6 +13,19 @@ def get_utc_range_from_ist_date(ist_date: date):
     end_utc = (end_ist - ist_offset).replace(tzinfo=timezone("UTC"))
     return start_utc, end_utc
 
+def get_ist_date(dt: datetime | str) -> date:
+    """
+    Get the IST calendar day for a UTC timestamp.
+
+    :param dt: UTC datetime (naive values are treated as UTC) or its ISO string.
+    :return: Date of the timestamp in IST.
+    """
+    if isinstance(dt, str):
+        dt = datetime.fromisoformat(dt)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone("UTC")).replace(tzinfo=None)
+    return (dt + timedelta(hours=5, minutes=30)).date()
+
 def get_now_for_timezone(tz: str="UTC") -> str:
     """
     Get the current timestamp in a specific timezone.
@@ -22,6 +35,14 @@ def get_now_for_timezone(tz: str="UTC") -> str:
     """
     return datetime.now(tz=timezone(tz)).isoformat()
 
+def get_utc_now() -> datetime:
+    """
+    Get the current UTC timestamp without tzinfo, as stored in the naive DateTime columns.
+
+    :return: Current UTC timestamp as a naive datetime object.
+    """
+    return datetime.now(tz=timezone("UTC")).replace(tzinfo=None)
+
 def format_timestamp(dt: datetime, fmt: Optional[str]="%Y-%m-%d %H:%M:%S") -> str:
     """
     Format a datetime object into a string.
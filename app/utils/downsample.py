@@ -0,0 +1,44 @@
+from typing import Callable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def lttb(points: Sequence[T], threshold: int, x: Callable[[T], float], y: Callable[[T], float]) -> List[T]:
+    """
+    Downsample points with Largest-Triangle-Three-Buckets, keeping the visual shape of the series.
+
+    :param points: Points sorted by x.
+    :param threshold: Number of points to keep (the first and last are always kept).
+    :param x: Returns the x value of a point.
+    :param y: Returns the y value of a point.
+    :return: The selected points, in their original order.
+    """
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    xs = [x(point) for point in points]
+    ys = [y(point) for point in points]
+    selected = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    previous = 0
+
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        # Average of the next bucket is the third corner of the triangle
+        next_start, next_end = end, min(int((i + 2) * bucket_size) + 1, len(points))
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((xs[previous] - avg_x) * (ys[j] - ys[previous])
+                       - (xs[previous] - xs[j]) * (avg_y - ys[previous]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(points[best])
+        previous = best
+
+    selected.append(points[-1])
+    return selected
@@ -0,0 +1,35 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor.
+
+    :param values: Keyset values of the last row (datetimes are stored as ISO strings).
+    :return: URL-safe cursor string.
+    """
+    payload = json.dumps(values, default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    :param cursor: Cursor string received from the client.
+    :param size: Number of keyset values the cursor must hold.
+    :return: Keyset values in the order they were encoded.
+    :raises ValueError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
@@ -1,15 +1,15 @@
-import os
-from app.schemas.responses.url import URLSuccessItem
+import asyncio
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
 import boto3
-import json
-from app.core.configs import settings
 
-sqs = boto3.client(
-    "sqs",
-    region_name="ap-south-1",
-    aws_access_key_id=str(settings.ACCESS_KEY_ID),
-    aws_secret_access_key=str(settings.SECRET_ACCESS_KEY)
-)
+from app.core.configs import settings
+from app.utils.decorators.singleton import singleton
 
 QUEUE_MAP = {
     "INSTAGRAM": "https://sqs.ap-south-1.amazonaws.com/303258618035/instagram-inc-url-processing-queue",
@@ -18,23 +18,182 @@ QUEUE_MAP = {
     "WEBSITE": "https://sqs.ap-south-1.amazonaws.com/303258618035/website-inc-url-processing-queue"
 }
 
-def push_to_sqs(success_urls: list[URLSuccessItem]):
-    platform_groups = {}
-
-    for item in success_urls:
-        platform = item.platform.upper()
-        if platform not in QUEUE_MAP:
-            continue
-        platform_groups.setdefault(platform, []).append(item)
-
-    for platform, items in platform_groups.items():
-        entries = [
-            {
-                "Id": str(i),
-                "MessageBody": json.dumps(item.dict())
-            }
-            for i, item in enumerate(items)
-        ]
-        queue_url = QUEUE_MAP[platform]
-        for batch in (entries[i:i + 10] for i in range(0, len(entries), 10)):
-            sqs.send_message_batch(QueueUrl=queue_url, Entries=batch)
+# Hard limit of SendMessageBatch
+SQS_MAX_BATCH_ENTRIES = 10
+
+
+class InMemorySQSClient:
+    """
+    Local stand-in for the boto3 SQS client.
+
+    Implements send_message_batch, receive_message (with long polling and a
+    visibility timeout), delete_message_batch and change_message_visibility_batch.
+    Visible messages are kept per queue URL in ``messages``, received ones are
+    made visible again once their visibility timeout passes. Entries whose body
+    contains one of ``fail_markers`` are reported in ``Failed`` for the first
+    ``fail_attempts`` sends, to exercise retries. Safe to call from threads.
+    """
+
+    def __init__(self, fail_markers: Iterable[str] = (), fail_attempts: int = 1,
+                 visibility_timeout: float = 30):
+        self.messages: Dict[str, Deque[str]] = defaultdict(deque)
+        self.fail_markers = tuple(fail_markers)
+        self.fail_attempts = fail_attempts
+        self.visibility_timeout = visibility_timeout
+        self.calls = 0
+        self._failures: Dict[str, int] = defaultdict(int)
+        # Receipt handle -> (queue URL, body, monotonic time it becomes visible again)
+        self._in_flight: Dict[str, Tuple[str, str, float]] = {}
+        self._changed = threading.Condition()
+
+    def send_message_batch(self, QueueUrl: str, Entries: List[Dict[str, str]]) -> Dict[str, Any]:
+        with self._changed:
+            self.calls += 1
+            successful, failed = [], []
+            for entry in Entries:
+                body = entry["MessageBody"]
+                if any(marker in body for marker in self.fail_markers) and self._failures[body] < self.fail_attempts:
+                    self._failures[body] += 1
+                    failed.append({"Id": entry["Id"], "SenderFault": False, "Code": "InternalError"})
+                    continue
+                self.messages[QueueUrl].append(body)
+                successful.append({"Id": entry["Id"]})
+            self._changed.notify_all()
+        return {"Successful": successful, "Failed": failed}
+
+    def receive_message(self, QueueUrl: str, MaxNumberOfMessages: int = 1, WaitTimeSeconds: float = 0,
+                        VisibilityTimeout: Optional[float] = None, **kwargs) -> Dict[str, Any]:
+        timeout = self.visibility_timeout if VisibilityTimeout is None else VisibilityTimeout
+        deadline = time.monotonic() + WaitTimeSeconds
+        with self._changed:
+            self.calls += 1
+            while True:
+                now = time.monotonic()
+                self._release_expired(now)
+                queue = self.messages[QueueUrl]
+                if queue or now >= deadline:
+                    break
+                next_release = min((visible_at for _, _, visible_at in self._in_flight.values()), default=deadline)
+                self._changed.wait(max(min(deadline, next_release) - now, 0.001))
+
+            received = []
+            while queue and len(received) < MaxNumberOfMessages:
+                body = queue.popleft()
+                receipt_handle = uuid.uuid4().hex
+                self._in_flight[receipt_handle] = (QueueUrl, body, now + timeout)
+                received.append({"MessageId": receipt_handle, "ReceiptHandle": receipt_handle, "Body": body})
+        return {"Messages": received} if received else {}
+
+    def delete_message_batch(self, QueueUrl: str, Entries: List[Dict[str, str]]) -> Dict[str, Any]:
+        with self._changed:
+            self.calls += 1
+            successful, failed = [], []
+            for entry in Entries:
+                if self._in_flight.pop(entry["ReceiptHandle"], None) is None:
+                    failed.append({"Id": entry["Id"], "SenderFault": True, "Code": "ReceiptHandleIsInvalid"})
+                else:
+                    successful.append({"Id": entry["Id"]})
+        return {"Successful": successful, "Failed": failed}
+
+    def change_message_visibility_batch(self, QueueUrl: str, Entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        with self._changed:
+            self.calls += 1
+            now = time.monotonic()
+            self._release_expired(now)
+            successful, failed = [], []
+            for entry in Entries:
+                message = self._in_flight.get(entry["ReceiptHandle"])
+                if message is None:
+                    failed.append({"Id": entry["Id"], "SenderFault": True, "Code": "ReceiptHandleIsInvalid"})
+                    continue
+                self._in_flight[entry["ReceiptHandle"]] = (message[0], message[1], now + entry["VisibilityTimeout"])
+                successful.append({"Id": entry["Id"]})
+            self._changed.notify_all()
+        return {"Successful": successful, "Failed": failed}
+
+    def in_flight_count(self) -> int:
+        with self._changed:
+            return len(self._in_flight)
+
+    def _release_expired(self, now: float) -> None:
+        expired = [handle for handle, (_, _, visible_at) in self._in_flight.items() if visible_at <= now]
+        for handle in expired:
+            queue_url, body, _ = self._in_flight.pop(handle)
+            self.messages[queue_url].append(body)
+
+
+def create_sqs_client():
+    if settings.SQS_IN_MEMORY:
+        return InMemorySQSClient()
+    return boto3.client(
+        "sqs",
+        region_name="ap-south-1",
+        aws_access_key_id=str(settings.ACCESS_KEY_ID),
+        aws_secret_access_key=str(settings.SECRET_ACCESS_KEY)
+    )
+
+
+@singleton
+class SQSPublisher:
+    """
+    Sends scrape messages to the per-platform SQS queues for the outbox relay.
+
+    Every 10-entry batch is sent concurrently and failed entries are retried
+    with exponential backoff.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or create_sqs_client()
+        self.max_retries = settings.SQS_PUBLISHER_MAX_RETRIES
+        self.retry_base_delay = settings.SQS_PUBLISHER_RETRY_BASE_DELAY_SECONDS
+
+    def configure(self, client) -> None:
+        self.client = client
+
+    async def send(self, messages: Dict[str, Tuple[str, str]]) -> List[str]:
+        """
+        Send (queue URL, body) messages, one concurrent SendMessageBatch per 10 entries of a queue.
+
+        :param messages: Messages by id, used as the batch entry Id; unique, at most 80 alphanumeric, - or _ characters.
+        :return: Ids of the messages that could not be delivered after all retries.
+        """
+        by_queue: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for message_id, (queue_url, body) in messages.items():
+            by_queue[queue_url].append((message_id, body))
+
+        results = await asyncio.gather(*(
+            self._send_batch(queue_url, dict(entries[i:i + SQS_MAX_BATCH_ENTRIES]))
+            for queue_url, entries in by_queue.items()
+            for i in range(0, len(entries), SQS_MAX_BATCH_ENTRIES)
+        ))
+        return [message_id for undelivered in results for message_id in undelivered]
+
+    async def _send_batch(self, queue_url: str, entries: Dict[str, str]) -> List[str]:
+        rejected: List[str] = []
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self.retry_base_delay * 2 ** (attempt - 1) * (1 + random.random()))
+            try:
+                response = await asyncio.to_thread(
+                    self.client.send_message_batch,
+                    QueueUrl=queue_url,
+                    Entries=[{"Id": entry_id, "MessageBody": body} for entry_id, body in entries.items()]
+                )
+            except Exception as e:
+                print(f"SQS send to {queue_url} failed (attempt {attempt + 1}): {e}")
+                continue
+
+            failed = response.get("Failed", [])
+            # Sender faults (bad entry) fail the same way on every retry
+            for entry in failed:
+                if entry.get("SenderFault"):
+                    print(f"SQS rejected message {entries[entry['Id']]}: {entry.get('Code')} {entry.get('Message', '')}")
+                    rejected.append(entry["Id"])
+            entries = {entry["Id"]: entries[entry["Id"]] for entry in failed if not entry.get("SenderFault")}
+            if not entries:
+                break
+
+        return rejected + list(entries)
+
+
+sqs_publisher = SQSPublisher()
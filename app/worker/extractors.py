@@ -0,0 +1,238 @@
+"""
+Blocking per-platform extractors run by the scrape worker.
+
+Each takes a URL and returns the fields of a SnapshotIngestItem it could
+scrape (counters and owner); batch extractors take a list of URLs and return
+one result or BrokenURLError per URL. They are module-level functions so they
+can run in thread or process pools. Content that no longer exists raises
+BrokenURLError; any other exception is treated as transient.
+"""
+import re
+import threading
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Optional, Union
+from urllib.parse import parse_qs, urlparse
+
+from app.core.configs import settings
+from app.utils.date import get_utc_now
+from app.worker.owner_profiles import owner_profile_cache
+
+INSTAGRAM_SHORTCODE = re.compile(r"/(?:p|reel|reels|tv)/([A-Za-z0-9_-]+)")
+FACEBOOK_UNAVAILABLE = re.compile(r"unavailable|not available|removed|deleted|HTTP Error 404", re.IGNORECASE)
+WEBSITE_TIMEOUT_SECONDS = 15
+# Most ids videos.list and channels.list accept per call
+YOUTUBE_MAX_IDS_PER_CALL = 50
+
+# Extractor clients are not thread-safe, every pool thread keeps its own
+_local = threading.local()
+
+
+class BrokenURLError(Exception):
+    """The post or page behind the URL was removed or never existed."""
+
+
+def engagement_rate(likes: int, comments: int, followers: Optional[int]) -> int:
+    """Likes and comments as a whole percentage of the owner's followers."""
+    if not followers:
+        return 0
+    return round((likes + comments) * 100 / followers)
+
+
+def parse_count(value: str) -> int:
+    """Parse counts like ``1,204``, ``411K`` or ``1.2M``."""
+    value = value.replace(",", "").upper()
+    for suffix, factor in (("K", 1_000), ("M", 1_000_000), ("B", 1_000_000_000)):
+        if value.endswith(suffix):
+            return int(float(value[:-1]) * factor)
+    return int(float(value))
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Extract the YouTube video ID from any YouTube URL format."""
+    parsed_url = urlparse(url)
+    hostname = (parsed_url.hostname or "").lower()
+
+    if hostname in {"www.youtube.com", "youtube.com", "m.youtube.com"}:
+        if parsed_url.path == "/watch":
+            return parse_qs(parsed_url.query).get("v", [None])[0]
+        for prefix in ("/embed/", "/shorts/", "/live/"):
+            if parsed_url.path.startswith(prefix):
+                return parsed_url.path[len(prefix):].split("/")[0] or None
+    elif hostname == "youtu.be":
+        return parsed_url.path.lstrip("/").split("/")[0] or None
+
+    return None
+
+
+def extract_instagram(url: str) -> Dict[str, Any]:
+    import instaloader
+
+    match = INSTAGRAM_SHORTCODE.search(urlparse(url).path)
+    if not match:
+        raise BrokenURLError(f"No Instagram shortcode in {url}")
+
+    if not hasattr(_local, "instaloader"):
+        _local.instaloader = instaloader.Instaloader(quiet=True)
+    context = _local.instaloader.context
+    try:
+        post = instaloader.Post.from_shortcode(context, match.group(1))
+        # Built from the post metadata; followers need a request of their own
+        profile = post.owner_profile
+    except (instaloader.exceptions.QueryReturnedNotFoundException, instaloader.exceptions.BadResponseException) as e:
+        raise BrokenURLError(str(e)) from e
+
+    owner = owner_profile_cache.get("INSTAGRAM", profile.username)
+    if owner is None:
+        owner = {"username": profile.username, "fullname": profile.full_name, "followers": profile.followers}
+        owner_profile_cache.set("INSTAGRAM", profile.username, owner)
+
+    likes, comments = max(post.likes, 0), post.comments
+    return {
+        "likes": likes,
+        "comments": comments,
+        "views": post.video_view_count if post.is_video else None,
+        "engagement_rate": engagement_rate(likes, comments, owner["followers"]),
+        "owner": owner,
+    }
+
+
+def extract_facebook(url: str) -> Dict[str, Any]:
+    import yt_dlp
+
+    try:
+        with yt_dlp.YoutubeDL({"quiet": True, "no_warnings": True}) as ydl:
+            info = ydl.extract_info(url, download=False)
+    except yt_dlp.utils.DownloadError as e:
+        if FACEBOOK_UNAVAILABLE.search(str(e)):
+            raise BrokenURLError(str(e)) from e
+        raise
+
+    # Reels carry their stats in the uploader text: '411K views · 1K reactions | Title | Page'
+    uploader = info.get("uploader") or ""
+    views_match = re.search(r"([\d,.KMB]+)\s+views", uploader)
+    likes_match = re.search(r"([\d,.KMB]+)\s+reactions", uploader)
+    views = parse_count(views_match.group(1)) if views_match else info.get("view_count")
+    likes = parse_count(likes_match.group(1)) if likes_match else info.get("like_count") or 0
+    comments = info.get("comment_count") or 0
+    followers = info.get("channel_follower_count")
+
+    username = info.get("uploader_id") or info.get("channel_id")
+    return {
+        "likes": likes,
+        "comments": comments,
+        "views": views,
+        "engagement_rate": engagement_rate(likes, comments, followers),
+        "owner": {
+            "username": username,
+            "fullname": info.get("channel") or (uploader.split(" | ")[-1] if uploader else None),
+            "followers": followers,
+            "fetched_date": get_utc_now(),
+        } if username else None,
+    }
+
+
+def youtube_client():
+    from googleapiclient.discovery import build
+
+    if not hasattr(_local, "youtube"):
+        if not settings.YOUTUBE_API_KEY:
+            raise RuntimeError("YOUTUBE_API_KEY is not configured")
+        _local.youtube = build("youtube", "v3", developerKey=settings.YOUTUBE_API_KEY, cache_discovery=False)
+    return _local.youtube
+
+
+def youtube_list(resource, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Fetch statistics and snippet of videos or channels by id, one call per 50 ids."""
+    items = {}
+    for i in range(0, len(ids), YOUTUBE_MAX_IDS_PER_CALL):
+        chunk = ids[i:i + YOUTUBE_MAX_IDS_PER_CALL]
+        response = resource.list(part="statistics,snippet", id=",".join(chunk)).execute()
+        items.update((item["id"], item) for item in response["items"])
+    return items
+
+
+def youtube_owner(channel: Dict[str, Any]) -> Dict[str, Any]:
+    stats = channel["statistics"]
+    return {
+        "username": channel["id"],
+        "fullname": channel["snippet"].get("title"),
+        "followers": int(stats["subscriberCount"]) if "subscriberCount" in stats else None,
+    }
+
+
+def youtube_result(video: Dict[str, Any], owner: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    stats, snippet = video["statistics"], video["snippet"]
+    if owner is None:
+        owner = {"username": snippet["channelId"], "fullname": snippet.get("channelTitle"), "followers": None}
+
+    likes, comments = int(stats.get("likeCount", 0)), int(stats.get("commentCount", 0))
+    return {
+        "likes": likes,
+        "comments": comments,
+        "views": int(stats["viewCount"]) if "viewCount" in stats else None,
+        "engagement_rate": engagement_rate(likes, comments, owner["followers"]),
+        "owner": owner,
+    }
+
+
+def fetch_youtube_batch(urls: List[str]) -> List[Union[Dict[str, Any], BrokenURLError]]:
+    """
+    Scrape YouTube URLs with one videos.list call per 50 distinct videos and
+    one channels.list call per 50 distinct channels of those videos that are
+    not in the owner profile cache.
+    """
+    video_ids = [extract_video_id(url) for url in urls]
+    youtube = youtube_client()
+    videos = youtube_list(youtube.videos(), list(dict.fromkeys(video_id for video_id in video_ids if video_id)))
+
+    channel_ids = list(dict.fromkeys(video["snippet"]["channelId"] for video in videos.values()))
+    owners = owner_profile_cache.get_many("YOUTUBE", channel_ids)
+    fetched = youtube_list(youtube.channels(), [channel_id for channel_id in channel_ids if channel_id not in owners])
+    for channel_id, channel in fetched.items():
+        owners[channel_id] = youtube_owner(channel)
+        owner_profile_cache.set("YOUTUBE", channel_id, owners[channel_id])
+
+    results = []
+    for url, video_id in zip(urls, video_ids):
+        if not video_id:
+            results.append(BrokenURLError(f"No YouTube video id in {url}"))
+        elif video_id not in videos:
+            results.append(BrokenURLError(f"No video found for {video_id}"))
+        else:
+            video = videos[video_id]
+            results.append(youtube_result(video, owners.get(video["snippet"]["channelId"])))
+    return results
+
+
+def extract_youtube(url: str) -> Dict[str, Any]:
+    result = fetch_youtube_batch([url])[0]
+    if isinstance(result, BrokenURLError):
+        raise result
+    return result
+
+
+def extract_website(url: str) -> Dict[str, Any]:
+    """Websites expose no traffic numbers, so only check the page is still there."""
+    request = urllib.request.Request(url, method="GET", headers={"User-Agent": "Mozilla/5.0 inc-url-analyzer"})
+    try:
+        with urllib.request.urlopen(request, timeout=WEBSITE_TIMEOUT_SECONDS) as response:
+            response.read(1)
+    except urllib.error.HTTPError as e:
+        if e.code in (404, 410):
+            raise BrokenURLError(f"{url} returned {e.code}") from e
+        raise
+    return {}
+
+
+EXTRACTORS = {
+    "INSTAGRAM": extract_instagram,
+    "FACEBOOK": extract_facebook,
+    "YOUTUBE": extract_youtube,
+    "WEBSITE": extract_website,
+}
+
+# Platforms whose messages are scraped together, preferred over EXTRACTORS
+BATCH_EXTRACTORS = {
+    "YOUTUBE": fetch_youtube_batch,
+}
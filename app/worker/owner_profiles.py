@@ -0,0 +1,93 @@
+import os
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from sqlmodel import Session, select
+
+from app.core.configs import settings
+from app.core.session import engine
+from app.models.entity import Entity
+from app.models.enums.platform import PlatformEnum
+from app.utils.cache import CacheBackend, InMemoryCacheBackend
+from app.utils.date import get_utc_now
+from app.utils.decorators.singleton import singleton
+
+# Process pool workers must not reuse the connections of the process they were forked from
+os.register_at_fork(after_in_child=lambda: engine.dispose(close=False))
+
+
+@singleton
+class OwnerProfileCache:
+    """
+    Owner profiles (username, fullname, followers, fetched_date) per platform and
+    owner id, the username the entity is stored under.
+
+    Scrapers look the owner of a post up here before fetching its profile, so a
+    creator's followers are fetched at most once per OWNER_PROFILE_CACHE_TTL_SECONDS
+    instead of once per post. Entries live in an InMemoryCacheBackend (TTL and
+    LRU eviction, one per process). With OWNER_PROFILE_CACHE_PERSIST a miss
+    falls back to the entity table, reusing profiles fetched within the TTL;
+    profiles reach the table through snapshot ingestion.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        self.backend = backend or InMemoryCacheBackend(max_entries=settings.OWNER_PROFILE_CACHE_MAX_ENTRIES)
+        self.ttl = settings.OWNER_PROFILE_CACHE_TTL_SECONDS
+        self.persist = settings.OWNER_PROFILE_CACHE_PERSIST
+
+    def configure(self, backend: CacheBackend) -> None:
+        self.backend = backend
+
+    @staticmethod
+    def build_key(platform: str, owner_id: str) -> str:
+        return f"{platform}:{owner_id}"
+
+    def get(self, platform: str, owner_id: str) -> Optional[Dict[str, Any]]:
+        return self.get_many(platform, [owner_id]).get(owner_id)
+
+    def get_many(self, platform: str, owner_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """:return: Cached profiles by owner id, missing ones left out."""
+        profiles, missing = {}, []
+        for owner_id in dict.fromkeys(owner_ids):
+            profile = self.backend.get(self.build_key(platform, owner_id))
+            if profile is None:
+                missing.append(owner_id)
+            else:
+                profiles[owner_id] = profile
+        if missing and self.persist:
+            profiles.update(self.load(platform, missing))
+        return profiles
+
+    def set(self, platform: str, owner_id: str, profile: Dict[str, Any]) -> None:
+        """Cache a profile just fetched; ``profile["fetched_date"]`` defaults to now."""
+        profile.setdefault("fetched_date", get_utc_now())
+        self.backend.set(self.build_key(platform, owner_id), profile, self.ttl, [])
+
+    def load(self, platform: str, owner_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cache and return the profiles stored on entity that were fetched within the TTL."""
+        now = get_utc_now()
+        try:
+            with Session(engine) as session:
+                rows = session.exec(
+                    select(Entity.username, Entity.fullname, Entity.followers, Entity.profileFetchedDate)
+                    .where(Entity.platform == PlatformEnum(platform), Entity.username.in_(list(owner_ids)),
+                           Entity.profileFetchedDate > now - timedelta(seconds=self.ttl),
+                           Entity.followers.is_not(None))
+                    .distinct(Entity.username)
+                    .order_by(Entity.username, Entity.profileFetchedDate.desc())
+                ).all()
+        except Exception as e:
+            print(f"Owner profile cache failed to load {platform} profiles: {e}")
+            return {}
+
+        profiles = {}
+        for row in rows:
+            profile = {"username": row.username, "fullname": row.fullname, "followers": row.followers,
+                       "fetched_date": row.profileFetchedDate}
+            remaining = self.ttl - (now - row.profileFetchedDate).total_seconds()
+            self.backend.set(self.build_key(platform, row.username), profile, remaining, [])
+            profiles[row.username] = profile
+        return profiles
+
+
+owner_profile_cache = OwnerProfileCache()
@@ -0,0 +1,335 @@
+import asyncio
+import json
+import time
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.configs import settings
+from app.core.session import async_engine
+from app.schemas.requests.url import SnapshotIngestItem
+from app.schemas.responses.url import URLSuccessItem
+from app.services.snapshot_ingest import ingest_snapshots
+from app.utils.date import get_utc_now
+from app.utils.sqs import QUEUE_MAP, SQS_MAX_BATCH_ENTRIES, create_sqs_client
+from app.worker.extractors import BATCH_EXTRACTORS, EXTRACTORS, BrokenURLError
+
+Extractor = Callable[[str], Dict[str, Any]]
+BatchExtractor = Callable[[List[str]], List[Union[Dict[str, Any], BrokenURLError]]]
+Sink = Callable[[List[SnapshotIngestItem]], Awaitable[Any]]
+
+
+class ReceivedMessage:
+    """An SQS message the worker holds until its result is stored and it is deleted."""
+    __slots__ = ("platform", "queue_url", "receipt_handle", "body", "visible_until")
+
+    def __init__(self, platform: str, queue_url: str, receipt_handle: str, body: str, visible_until: float):
+        self.platform = platform
+        self.queue_url = queue_url
+        self.receipt_handle = receipt_handle
+        self.body = body
+        self.visible_until = visible_until
+
+
+async def ingest_results(items: List[SnapshotIngestItem]) -> None:
+    async with AsyncSession(async_engine, expire_on_commit=False) as db:
+        await ingest_snapshots(db, items)
+
+
+def snapshot_from_result(message: URLSuccessItem, result: Dict[str, Any]) -> SnapshotIngestItem:
+    return SnapshotIngestItem(
+        url_id=message.url_id,
+        snapshot_id=message.post_id or message.web_id,
+        date_analyzed=get_utc_now(),
+        **result
+    )
+
+
+class ScrapeWorker:
+    """
+    Consumes the per-platform scrape queues and stores the results.
+
+    Every platform queue gets a poller that long-polls only for as many
+    messages as it has free extraction slots (SCRAPE_WORKER_CONCURRENCY), and
+    runs the blocking extractor in a thread pool, or a process pool for
+    SCRAPE_WORKER_PROCESS_PLATFORMS. Platforms with a batch extractor (YouTube)
+    gather up to SCRAPE_WORKER_EXTRACTION_BATCH_SIZE waiting messages per
+    extractor call instead. Results are stored through ``sink`` in
+    batches of SCRAPE_WORKER_INGEST_BATCH_SIZE (or after
+    SCRAPE_WORKER_FLUSH_INTERVAL_SECONDS) and their messages deleted with
+    DeleteMessageBatch afterwards, so a crash redelivers instead of losing
+    them. A heartbeat extends the visibility timeout of every message still
+    held. Messages whose extraction fails transiently are left to reappear
+    after their visibility timeout.
+    """
+
+    def __init__(self, client=None, extractors: Optional[Dict[str, Extractor]] = None, sink: Optional[Sink] = None,
+                 concurrency: Optional[Dict[str, int]] = None, process_platforms: Optional[Iterable[str]] = None,
+                 batch_extractors: Optional[Dict[str, BatchExtractor]] = None):
+        self.client = client or create_sqs_client()
+        self.extractors = extractors or EXTRACTORS
+        # The built-in batch extractors only come with the built-in extractors
+        if batch_extractors is None:
+            batch_extractors = BATCH_EXTRACTORS if extractors is None else {}
+        self.batch_extractors = batch_extractors
+        self.sink = sink or ingest_results
+        self.concurrency = {
+            platform: limit
+            for platform, limit in (concurrency or settings.SCRAPE_WORKER_CONCURRENCY).items()
+            if platform in QUEUE_MAP and (platform in self.extractors or platform in self.batch_extractors) and limit > 0
+        }
+        self.process_platforms = set(
+            settings.SCRAPE_WORKER_PROCESS_PLATFORMS if process_platforms is None else process_platforms
+        )
+        self.wait_time = settings.SCRAPE_WORKER_WAIT_TIME_SECONDS
+        self.visibility_timeout = settings.SCRAPE_WORKER_VISIBILITY_TIMEOUT_SECONDS
+        self.ingest_batch_size = settings.SCRAPE_WORKER_INGEST_BATCH_SIZE
+        self.extraction_batch_size = settings.SCRAPE_WORKER_EXTRACTION_BATCH_SIZE
+        self.flush_interval = settings.SCRAPE_WORKER_FLUSH_INTERVAL_SECONDS
+        self.processed = 0
+        self.failed = 0
+        self._held: Dict[str, ReceivedMessage] = {}
+        self._pools: Dict[str, Executor] = {}
+        self._results: Optional[asyncio.Queue] = None
+        self._stopping = False
+        self._pollers: List[asyncio.Task] = []
+        self._extractions: set = set()
+        self._flusher: Optional[asyncio.Task] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._flusher is not None and not self._flusher.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._stopping = False
+        self._results = asyncio.Queue()
+        for platform, limit in self.concurrency.items():
+            pool_class = ProcessPoolExecutor if platform in self.process_platforms else ThreadPoolExecutor
+            self._pools[platform] = pool_class(max_workers=limit)
+            poll = self._poll_batches if platform in self.batch_extractors else self._poll
+            self._pollers.append(asyncio.create_task(poll(platform, limit)))
+        self._flusher = asyncio.create_task(self._flush_results())
+        self._heartbeat = asyncio.create_task(self._extend_visibility())
+
+    async def stop(self) -> None:
+        """Stop receiving, finish the extractions in flight and store their results."""
+        if not self.running:
+            return
+        self._stopping = True
+        # A poller blocked in a long poll is abandoned; what it receives reappears after the visibility timeout
+        for poller in self._pollers:
+            poller.cancel()
+        await asyncio.gather(*self._pollers, return_exceptions=True)
+        await asyncio.gather(*self._extractions, return_exceptions=True)
+        await self._results.put(None)
+        await self._flusher
+        self._heartbeat.cancel()
+        await asyncio.gather(self._heartbeat, return_exceptions=True)
+        for pool in self._pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._pollers, self._pools, self._flusher, self._heartbeat = [], {}, None, None
+
+    async def run(self) -> None:
+        """Run until cancelled (e.g. by Ctrl+C), then stop cleanly."""
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+
+    async def _poll(self, platform: str, limit: int) -> None:
+        slots = asyncio.Semaphore(limit)
+        while not self._stopping:
+            # Only take messages there is a free slot for, so none wait with a ticking visibility timeout
+            await slots.acquire()
+            wanted = 1
+            while wanted < SQS_MAX_BATCH_ENTRIES and not slots.locked():
+                await slots.acquire()
+                wanted += 1
+
+            messages = await self._receive(platform, wanted, self.wait_time)
+            for _ in range(wanted - len(messages)):
+                slots.release()
+            for held in messages:
+                self._spawn(self._extract([held], slots))
+
+    async def _poll_batches(self, platform: str, limit: int) -> None:
+        """Like _poll, but a slot takes up to extraction_batch_size messages for one batch extractor call."""
+        slots = asyncio.Semaphore(limit)
+        while not self._stopping:
+            await slots.acquire()
+            batch: List[ReceivedMessage] = []
+            # Long-poll for the first messages, then only take what is already waiting
+            while len(batch) < self.extraction_batch_size:
+                wanted = min(SQS_MAX_BATCH_ENTRIES, self.extraction_batch_size - len(batch))
+                received = await self._receive(platform, wanted, 0 if batch else self.wait_time)
+                batch.extend(received)
+                if len(received) < wanted and batch:
+                    break
+
+            if batch:
+                self._spawn(self._extract(batch, slots))
+            else:
+                slots.release()
+
+    async def _receive(self, platform: str, count: int, wait_time: int) -> List[ReceivedMessage]:
+        queue_url = QUEUE_MAP[platform]
+        try:
+            response = await asyncio.to_thread(
+                self.client.receive_message,
+                QueueUrl=queue_url,
+                MaxNumberOfMessages=count,
+                WaitTimeSeconds=wait_time,
+                VisibilityTimeout=self.visibility_timeout,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Scrape worker failed to receive from {platform}: {e}")
+            await asyncio.sleep(1)
+            return []
+
+        visible_until = time.monotonic() + self.visibility_timeout
+        messages = []
+        for message in response.get("Messages", []):
+            held = ReceivedMessage(platform, queue_url, message["ReceiptHandle"], message["Body"], visible_until)
+            self._held[held.receipt_handle] = held
+            messages.append(held)
+        return messages
+
+    def _spawn(self, extraction: Awaitable[None]) -> None:
+        task = asyncio.create_task(extraction)
+        self._extractions.add(task)
+        task.add_done_callback(self._extractions.discard)
+
+    def _drop(self, held: ReceivedMessage, error: Any) -> None:
+        """Stop holding a message that failed, so it reappears after its visibility timeout."""
+        print(f"Scrape worker failed on {held.platform} message {held.body}: {error}")
+        self.failed += 1
+        self._held.pop(held.receipt_handle, None)
+
+    async def _extract(self, messages: List[ReceivedMessage], slots: asyncio.Semaphore) -> None:
+        """Scrape messages of one platform, with its batch extractor if it has one, and queue the results."""
+        platform = messages[0].platform
+        parsed: List[Tuple[ReceivedMessage, URLSuccessItem]] = []
+        for held in messages:
+            try:
+                parsed.append((held, URLSuccessItem(**json.loads(held.body))))
+            except Exception as e:
+                self._drop(held, e)
+
+        try:
+            loop = asyncio.get_running_loop()
+            pool = self._pools[platform]
+            if parsed and platform in self.batch_extractors:
+                results = await loop.run_in_executor(
+                    pool, self.batch_extractors[platform], [message.url for _, message in parsed]
+                )
+            else:
+                results = []
+                for _, message in parsed:
+                    try:
+                        results.append(await loop.run_in_executor(pool, self.extractors[platform], message.url))
+                    except BrokenURLError as e:
+                        results.append(e)
+
+            snapshots = [
+                (held, snapshot_from_result(
+                    message, {"is_broken_or_deleted": True} if isinstance(result, BrokenURLError) else result
+                ))
+                for (held, message), result in zip(parsed, results)
+            ]
+            for snapshot in snapshots:
+                await self._results.put(snapshot)
+        except Exception as e:
+            for held, _ in parsed:
+                self._drop(held, e)
+        finally:
+            slots.release()
+
+    async def _flush_results(self) -> None:
+        stopping = False
+        while not stopping:
+            result = await self._results.get()
+            if result is None:
+                break
+
+            pending = [result]
+            deadline = time.monotonic() + self.flush_interval
+            while len(pending) < self.ingest_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    result = await asyncio.wait_for(self._results.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if result is None:
+                    stopping = True
+                    break
+                pending.append(result)
+
+            try:
+                await self.sink([item for _, item in pending])
+            except Exception as e:
+                # Left to reappear after their visibility timeout
+                print(f"Scrape worker failed to store {len(pending)} results: {e}")
+                self.failed += len(pending)
+                for held, _ in pending:
+                    self._held.pop(held.receipt_handle, None)
+                continue
+
+            self.processed += len(pending)
+            await self._delete([held for held, _ in pending])
+
+    async def _delete(self, messages: List[ReceivedMessage]) -> None:
+        for held in messages:
+            self._held.pop(held.receipt_handle, None)
+        await self._send_batches("delete_message_batch", messages, lambda held: {})
+
+    async def _extend_visibility(self) -> None:
+        interval = self.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            # Extend what would otherwise expire before the next beat, with one beat of margin
+            expiring = [held for held in self._held.values() if held.visible_until - now < 2 * interval]
+            for held in expiring:
+                held.visible_until = now + self.visibility_timeout
+            await self._send_batches(
+                "change_message_visibility_batch", expiring, lambda held: {"VisibilityTimeout": self.visibility_timeout}
+            )
+
+    async def _send_batches(self, operation: str, messages: List[ReceivedMessage],
+                            entry_fields: Callable[[ReceivedMessage], Dict[str, Any]]) -> None:
+        """Run an SQS batch operation over the messages, one concurrent call per 10 entries of a queue."""
+        by_queue: Dict[str, List[ReceivedMessage]] = defaultdict(list)
+        for held in messages:
+            by_queue[held.queue_url].append(held)
+
+        batches: List[Tuple[str, List[ReceivedMessage]]] = [
+            (queue_url, held[i:i + SQS_MAX_BATCH_ENTRIES])
+            for queue_url, held in by_queue.items()
+            for i in range(0, len(held), SQS_MAX_BATCH_ENTRIES)
+        ]
+        results = await asyncio.gather(*(
+            asyncio.to_thread(
+                getattr(self.client, operation),
+                QueueUrl=queue_url,
+                Entries=[
+                    {"Id": str(i), "ReceiptHandle": held.receipt_handle, **entry_fields(held)}
+                    for i, held in enumerate(batch)
+                ]
+            )
+            for queue_url, batch in batches
+        ), return_exceptions=True)
+        for (queue_url, batch), result in zip(batches, results):
+            if isinstance(result, Exception):
+                print(f"SQS {operation} on {queue_url} failed for {len(batch)} messages: {result}")
+            elif result.get("Failed"):
+                print(f"SQS {operation} on {queue_url} failed for {len(result['Failed'])} messages: {result['Failed']}")
@@ -10,6 +10,11 @@ from app.models.entity import Entity
 from app.models.post import Post
 from app.models.blog_web_post import BlogWebPost
 from app.models.url import URL
+from app.models.url_latest_metrics import URLLatestMetrics
+from app.models.url_import_job import URLImportJob
+from app.models.scrape_outbox import ScrapeOutbox
+from app.models.url_reanalysis_job import URLReanalysisJob
+from app.models.entity_metrics import EntityMetrics
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
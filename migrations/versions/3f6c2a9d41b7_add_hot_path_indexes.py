@@ -0,0 +1,67 @@
+"""add hot path indexes
+
+Indexes the columns every read endpoint filters, joins or orders on:
+latest snapshot per URL, URLs per upload date / entity, and the URL
+equality lookup done on upload.
+
+Indexes are built with CREATE INDEX CONCURRENTLY outside the migration
+transaction, so production tables stay writable while they build.
+
+url_latest_metrics is created by init_db; where it does not exist yet its
+index is skipped, create_all builds the table with it.
+
+Revision ID: 3f6c2a9d41b7
+Revises: 
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f6c2a9d41b7'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_post_url_id_date_analyzed", "post", ["url_id", sa.text("date_analyzed DESC")], False),
+    ("ix_blog_web_post_url_id_date_analyzed", "blog_web_post", ["url_id", sa.text("date_analyzed DESC")], False),
+    ("ix_url_created_date", "url", ["created_date"], False),
+    ("ix_url_url", "url", ["url"], True),
+    ("ix_url_entity_id", "url", ["entity_id"], False),
+    ("ix_url_latest_metrics_listing", "url_latest_metrics",
+     ["upload_date", "engagement_rate", "date_uploaded", "url_id"], False),
+]
+
+
+def indexes_of_existing_tables():
+    inspector = sa.inspect(op.get_bind())
+    return [index for index in INDEXES if inspector.has_table(index[1])]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    duplicates = op.get_bind().execute(
+        sa.text("SELECT url FROM url GROUP BY url HAVING count(*) > 1 LIMIT 5")
+    ).scalars().all()
+    if duplicates:
+        # A failed concurrent build leaves an INVALID index behind, so refuse up front
+        raise RuntimeError(f"Cannot create unique index ix_url_url, duplicate URLs exist: {duplicates}")
+
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in indexes_of_existing_tables():
+            op.create_index(
+                name, table, columns, unique=unique, postgresql_concurrently=True, if_not_exists=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(indexes_of_existing_tables()):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,207 @@
+"""add url canonical key
+
+Adds url.canonical_key (sha256 of the canonical URL form) with a unique
+index so upload dedupe is a single indexed lookup.
+
+Existing rows are backfilled in batches. When older rows already share a
+canonical form, only the oldest one gets the key and the others keep NULL,
+so the unique index can be built without deleting any data.
+
+Revision ID: 8b1e4c7d2a90
+Revises: 3f6c2a9d41b7
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+import hashlib
+import re
+from typing import List, Optional, Sequence, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4c7d2a90'
+down_revision: Union[str, Sequence[str], None] = '3f6c2a9d41b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+CANONICAL_KEY_LENGTH = 64
+
+# Frozen copy of app.utils.canonical_url as of this revision, so the backfill
+# keeps writing the same keys whatever later changes the canonicalizer gets.
+
+# Mobile and alternate front-end hosts of the platforms, stripped only when
+# the rest is in PLATFORM_HOSTS; on other sites they may be separate sites
+PLATFORM_HOST_PREFIXES = ("m.", "mobile.", "web.", "mbasic.")
+
+# Query parameters (besides utm_*) that only track the click on any site
+TRACKING_PARAMS = {"fbclid", "gclid", "dclid"}
+
+YOUTUBE_HOSTS = {"youtube.com", "youtu.be", "youtube-nocookie.com"}
+INSTAGRAM_HOSTS = {"instagram.com", "instagr.am"}
+FACEBOOK_HOSTS = {"facebook.com", "fb.com"}
+PLATFORM_HOSTS = YOUTUBE_HOSTS | INSTAGRAM_HOSTS | FACEBOOK_HOSTS
+
+# Share parameters of the platforms above; on other sites they may identify the content
+PLATFORM_TRACKING_PARAMS = {"igsh", "igshid", "mibextid", "si", "feature", "ref", "ref_src", "rdid", "share_url",
+                            "sfnsn", "_rdr"}
+
+YOUTUBE_VIDEO_ID = re.compile(r"^[A-Za-z0-9_-]{11}$")
+YOUTUBE_PATH_PREFIXES = ("/embed/", "/shorts/", "/live/", "/v/")
+INSTAGRAM_MEDIA = re.compile(r"^/(?:[^/]+/)?(?:p|reel|reels|tv)/([A-Za-z0-9_-]+)")
+FACEBOOK_VIDEO = re.compile(r"^/(?:[^/]+/videos/(?:[^/]+/)?|reel/|watch/live/)(\d+)")
+FACEBOOK_POST = re.compile(r"^/([^/]+)/posts/([^/]+)")
+
+
+def normalize_host(host: str) -> str:
+    host = host.lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[len("www."):]
+    for prefix in PLATFORM_HOST_PREFIXES:
+        if host.startswith(prefix) and host[len(prefix):] in PLATFORM_HOSTS:
+            return host[len(prefix):]
+    return host
+
+
+def youtube_video_id(host: str, path: str, query: dict) -> Optional[str]:
+    """Video id of a youtube.com/watch, /embed, /shorts, /live or youtu.be URL."""
+    if host == "youtu.be":
+        video_id = path.strip("/").split("/")[0]
+    elif path.rstrip("/") == "/watch":
+        video_id = query.get("v", "")
+    else:
+        video_id = next((path[len(prefix):].split("/")[0] for prefix in YOUTUBE_PATH_PREFIXES
+                         if path.startswith(prefix)), "")
+    return video_id if YOUTUBE_VIDEO_ID.match(video_id) else None
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name.startswith("utm_") or name in TRACKING_PARAMS
+
+
+def canonical_platform_url(host: str, path: str, params: List[Tuple[str, str]]) -> Optional[str]:
+    """
+    Canonical form of a YouTube, Instagram or Facebook URL, otherwise None.
+
+    Posts and videos the platform identifies by id are reduced to that id;
+    other pages of those platforms lose only the platform share parameters.
+    """
+    if host not in PLATFORM_HOSTS:
+        return None
+    query = dict(params)
+
+    if host in YOUTUBE_HOSTS:
+        video_id = youtube_video_id(host, path, query)
+        if video_id:
+            return f"https://youtube.com/watch?v={video_id}"
+
+    elif host in INSTAGRAM_HOSTS:
+        match = INSTAGRAM_MEDIA.match(path)
+        if match:
+            return f"https://instagram.com/p/{match.group(1)}"
+
+    else:
+        if path.rstrip("/") == "/watch" and query.get("v", "").isdigit():
+            return f"https://facebook.com/videos/{query['v']}"
+        if path.rstrip("/") in {"/story.php", "/permalink.php"} and query.get("story_fbid"):
+            return f"https://facebook.com/story.php?story_fbid={query['story_fbid']}&id={query.get('id', '')}"
+        match = FACEBOOK_VIDEO.match(path)
+        if match:
+            return f"https://facebook.com/videos/{match.group(1)}"
+        match = FACEBOOK_POST.match(path)
+        if match:
+            return f"https://facebook.com/{match.group(1).lower()}/posts/{match.group(2)}"
+
+    return generic_canonical_url(host, path, [(name, value) for name, value in params
+                                              if name.lower() not in PLATFORM_TRACKING_PARAMS])
+
+
+def generic_canonical_url(host: str, path: str, params: List[Tuple[str, str]], port: str = "") -> str:
+    path = re.sub(r"/{2,}", "/", path).rstrip("/") or "/"
+    query = urlencode(sorted(params))
+    return f"https://{host}{port}{path}" + (f"?{query}" if query else "")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Canonical form of a URL, identical for every variant of the same content.
+
+    Scheme, host case, the www. prefix, default ports, fragments and click
+    tracking parameters (utm_*, fbclid, gclid) are dropped, as are the m./web.
+    prefixes of YouTube, Instagram and Facebook hosts. YouTube videos,
+    Instagram posts/reels and Facebook posts/videos are reduced to their id, so
+    youtu.be/X and youtube.com/watch?v=X share one form; other pages of those
+    platforms also drop their share parameters (igsh, si, ...). Paths of other
+    sites keep their case.
+    """
+    parts = urlsplit(url.strip())
+    host = normalize_host(parts.hostname or "")
+    params = [(name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+              if not is_tracking_param(name)]
+
+    canonical = canonical_platform_url(host, parts.path or "/", params)
+    if canonical:
+        return canonical
+
+    try:
+        port = f":{parts.port}" if parts.port and parts.port not in (80, 443) else ""
+    except ValueError:
+        port = ""
+    return generic_canonical_url(host, parts.path, params, port)
+
+
+def canonical_key(url: str) -> str:
+    """Fixed-width key of the canonical form of a URL, stored in url.canonical_key."""
+    return hashlib.sha256(canonicalize_url(url).encode()).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("url", sa.Column("canonical_key", sa.String(CANONICAL_KEY_LENGTH), nullable=True))
+
+    bind = op.get_bind()
+    seen = set(bind.execute(
+        sa.text("SELECT canonical_key FROM url WHERE canonical_key IS NOT NULL")
+    ).scalars().all())
+    duplicates = 0
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, url FROM url WHERE id > :last_id AND canonical_key IS NULL ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+
+        updates = []
+        for url_id, url in rows:
+            key = canonical_key(url)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            updates.append({"url_id": url_id, "key": key})
+        if updates:
+            bind.execute(sa.text("UPDATE url SET canonical_key = :key WHERE id = :url_id"), updates)
+        last_id = rows[-1].id
+
+    if duplicates:
+        print(f"{duplicates} URLs share a canonical form with an older URL and were left without a canonical key")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_url_canonical_key", "url", ["canonical_key"], unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_url_canonical_key", table_name="url", postgresql_concurrently=True, if_exists=True)
+    op.drop_column("url", "canonical_key")
@@ -0,0 +1,44 @@
+"""add entity profile fetched date
+
+Adds entity.profile_fetched_date, the time fullname/followers were last
+fetched from the platform, so scrapers can reuse a recent owner profile
+instead of fetching it again, and indexes entity by (platform, username),
+the key owners are looked up by.
+
+Revision ID: a5c91e3f7d64
+Revises: e7a3f19c5d20
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5c91e3f7d64'
+down_revision: Union[str, Sequence[str], None] = 'e7a3f19c5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fresh databases whose entity table init_db's create_all created already have the column
+    op.execute("ALTER TABLE entity ADD COLUMN IF NOT EXISTS profile_fetched_date TIMESTAMP WITHOUT TIME ZONE")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_entity_platform_username", "entity", ["platform", "username"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_entity_platform_username", table_name="entity", postgresql_concurrently=True, if_exists=True
+        )
+    op.execute("ALTER TABLE entity DROP COLUMN IF EXISTS profile_fetched_date")
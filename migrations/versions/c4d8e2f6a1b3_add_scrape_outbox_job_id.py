@@ -0,0 +1,50 @@
+"""add scrape outbox job id
+
+Links scrape_outbox rows to the bulk re-analysis job that queued them.
+
+scrape_outbox is created by init_db; on databases where it does not exist
+yet there is nothing to alter, create_all builds it with the column.
+
+Revision ID: c4d8e2f6a1b3
+Revises: 8b1e4c7d2a90
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f6a1b3'
+down_revision: Union[str, Sequence[str], None] = '8b1e4c7d2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def has_outbox_table() -> bool:
+    return sa.inspect(op.get_bind()).has_table("scrape_outbox")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_outbox_table():
+        return
+
+    op.execute("ALTER TABLE scrape_outbox ADD COLUMN IF NOT EXISTS job_id VARCHAR(32)")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_scrape_outbox_job_id", "scrape_outbox", ["job_id"], postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not has_outbox_table():
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_scrape_outbox_job_id", table_name="scrape_outbox", postgresql_concurrently=True, if_exists=True)
+    op.execute("ALTER TABLE scrape_outbox DROP COLUMN IF EXISTS job_id")
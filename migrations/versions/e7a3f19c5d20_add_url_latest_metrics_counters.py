@@ -0,0 +1,74 @@
+"""add url latest metrics counters
+
+Stores the likes, comments and views of the latest snapshot on
+url_latest_metrics, so replacing it can update entity_metrics by a delta, and
+indexes the table by entity.
+
+url_latest_metrics is created by init_db; on databases where it does not exist
+yet there is nothing to alter, create_all builds it with the columns. Existing
+rows are backfilled from the snapshot they were recorded from. entity_metrics
+is created and filled by init_db.
+
+Revision ID: e7a3f19c5d20
+Revises: c4d8e2f6a1b3
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3f19c5d20'
+down_revision: Union[str, Sequence[str], None] = 'c4d8e2f6a1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def has_latest_metrics_table() -> bool:
+    return sa.inspect(op.get_bind()).has_table("url_latest_metrics")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if not has_latest_metrics_table():
+        return
+
+    for column in ("likes", "comments", "views"):
+        op.execute(f"ALTER TABLE url_latest_metrics ADD COLUMN IF NOT EXISTS {column} INTEGER NOT NULL DEFAULT 0")
+
+    op.execute("""
+        UPDATE url_latest_metrics AS latest
+        SET likes = post.likes, comments = post.comments, views = coalesce(post.views, 0)
+        FROM post
+        WHERE latest.type = 'POST' AND post.url_id = latest.url_id AND post.date_analyzed = latest.date_analyzed
+    """)
+    op.execute("""
+        UPDATE url_latest_metrics AS latest
+        SET views = coalesce(blog.traffic_count, 0)
+        FROM blog_web_post AS blog
+        WHERE latest.type = 'WEB_POST' AND blog.url_id = latest.url_id AND blog.date_analyzed = latest.date_analyzed
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_url_latest_metrics_entity_id", "url_latest_metrics", ["entity_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if not has_latest_metrics_table():
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_url_latest_metrics_entity_id", table_name="url_latest_metrics",
+            postgresql_concurrently=True, if_exists=True
+        )
+    for column in ("likes", "comments", "views"):
+        op.execute(f"ALTER TABLE url_latest_metrics DROP COLUMN IF EXISTS {column}")